@@ -115,3 +115,14 @@ async def sunspec_client_fixture(
 ) -> ssst.sunspec.client.Client:
     await unscanned_sunspec_client.scan()
     return unscanned_sunspec_client
+
+
+@pytest.fixture(name="memory_sunspec_client")
+async def memory_sunspec_client_fixture(
+    sunspec_server: SunSpecServerFixtureResult,
+) -> typing.AsyncIterator[ssst.sunspec.client.Client]:
+    async with ssst.sunspec.client.open_memory_client(
+        server=sunspec_server.server
+    ) as client:
+        await client.scan()
+        yield client
@@ -1,9 +1,18 @@
+import pathlib
 import re
+import typing
 
+import attr
+import pymodbus.client.common
+import pymodbus.pdu
 import pytest
+import sunspec2.modbus.client
+import trio
+import trio.testing
 
 import ssst._tests.conftest
 import ssst.sunspec.client
+import ssst.sunspec.scan_cache
 import ssst.sunspec.server
 
 
@@ -23,6 +32,27 @@ async def test_scan_raises_for_missing_sentinel_when_searching(
         await unscanned_sunspec_client.scan()
 
 
+async def test_scan_probes_concurrently(
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    unscanned_sunspec_client.sunspec_device.base_addr_list[:] = [0, 40_010, 40_000]
+
+    await unscanned_sunspec_client.scan(concurrent_probes=True)
+
+    assert unscanned_sunspec_client.sunspec_device.base_addr == 40_000
+    assert unscanned_sunspec_client[1].model_addr == 40_002
+
+
+async def test_scan_raises_for_missing_sentinel_when_probing_concurrently(
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    unscanned_sunspec_client.sunspec_device.base_addr_list[:] = [0, 40_010]
+
+    message = "SunSpec sentinel b'SunS' not found while searching: 0, 40010"
+    with pytest.raises(ssst.BaseAddressNotFoundError, match=f"^{re.escape(message)}$"):
+        await unscanned_sunspec_client.scan(concurrent_probes=True)
+
+
 async def test_scan_raises_for_missing_sentinel_when_address_specified(
     unscanned_sunspec_client: ssst.sunspec.client.Client,
 ) -> None:
@@ -33,6 +63,31 @@ async def test_scan_raises_for_missing_sentinel_when_address_specified(
         await unscanned_sunspec_client.scan()
 
 
+@pytest.mark.parametrize(
+    argnames=["read_ahead", "requests", "errors"],
+    argvalues=[[False, 11, {}], [True, 6, {2: 1}]],
+)
+async def test_scan_populates_data(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+    read_ahead: bool,
+    requests: int,
+    errors: typing.Dict[int, int],
+) -> None:
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+    sunspec_server.server[126].points["ModEna"].cvalue = 1
+
+    await unscanned_sunspec_client.scan(read_ahead=read_ahead)
+
+    server_device = sunspec_server.server.slave_context.sunspec_device
+    client_device = unscanned_sunspec_client.sunspec_device
+    assert client_device.get_mb() == server_device.get_mb()
+
+    snapshot = unscanned_sunspec_client.metrics.snapshot()
+    assert snapshot.reads.requests == requests
+    assert snapshot.reads.errors == errors
+
+
 async def test_model_addresses(sunspec_client: ssst.sunspec.client.Client) -> None:
     model_ids = [model.model_addr for model in sunspec_client.sunspec_device.model_list]
 
@@ -174,3 +229,821 @@ async def test_write_modbus_exception_raises(
 ) -> None:
     with pytest.raises(ssst.ModbusError):
         await sunspec_client.write_registers(address=0, values=b":]")
+
+
+async def test_read_model(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[126]
+    server_model.points["V_SF"].cvalue = -2
+    server_model.points["DeptRef_SF"].cvalue = 0
+    server_model.points["ModEna"].cvalue = 1
+    server_model.groups["curve"][0].points["V1"].cvalue = 273
+    server_model.groups["curve"][-1].points["VAr1"].cvalue = 17
+
+    client_model = sunspec_client[126]
+    await sunspec_client.read_model(model=client_model)
+
+    assert client_model.get_mb() == server_model.get_mb()
+    assert client_model.groups["curve"][0].points["V1"].cvalue == 273
+
+
+async def test_read_models(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+    sunspec_server.server[17].points["Bits"].cvalue = 8
+    sunspec_server.server[103].points["W_SF"].cvalue = -2
+    sunspec_server.server[103].points["W"].cvalue = 273
+    sunspec_server.server[126].points["ModEna"].cvalue = 1
+
+    await sunspec_client.read_models()
+
+    server_device = sunspec_server.server.slave_context.sunspec_device
+    assert sunspec_client.sunspec_device.get_mb() == server_device.get_mb()
+
+
+async def test_read_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+    server_model.points["W"].cvalue = 273
+    server_model.points["Hz_SF"].cvalue = -1
+    server_model.points["Hz"].cvalue = 60
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+
+    points = [
+        sunspec_client[103].points["W"],
+        sunspec_client[1].points["DA"],
+        sunspec_client[103].points["Hz"],
+    ]
+
+    values = await sunspec_client.read_points(points=points, max_gap=8)
+
+    assert values == [273, 43928, 60]
+
+
+@pytest.mark.parametrize(
+    argnames=["spans", "max_gap", "expected"],
+    argvalues=[
+        [[(10, 2), (12, 1)], 0, [(10, 3)]],
+        [[(10, 2), (13, 1)], 0, [(10, 2), (13, 1)]],
+        [[(13, 1), (10, 2)], 1, [(10, 4)]],
+        [[(10, 4), (11, 1)], 0, [(10, 4)]],
+        [[(0, 100), (100, 26)], 0, [(0, 100), (100, 26)]],
+    ],
+)
+def test_plan_register_ranges(
+    spans: typing.List[typing.Tuple[int, int]],
+    max_gap: int,
+    expected: typing.List[typing.Tuple[int, int]],
+) -> None:
+    ranges = ssst.sunspec.client.plan_register_ranges(spans=spans, max_gap=max_gap)
+
+    assert [(r.address, r.count) for r in ranges] == expected
+
+
+async def test_compiled_read_plan(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+
+    plan = sunspec_client.compile_read_plan(names=[(103, "W"), ("common", "DA")])
+
+    for watts, device_address in [[273, 1], [150, 2]]:
+        server_model.points["W"].cvalue = watts
+        sunspec_server.server[1].points["DA"].cvalue = device_address
+
+        values = await sunspec_client.execute_read_plan(plan=plan)
+
+        assert values == [watts, device_address]
+
+
+async def test_scan_cache_records_and_reuses_layout(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+    tmp_path: pathlib.Path,
+) -> None:
+    common_model = sunspec_server.server[1]
+    common_model.points["Mn"].cvalue = "EPC Power"
+    common_model.points["Md"].cvalue = "CAB1000"
+    common_model.points["SN"].cvalue = "1234"
+    sunspec_server.server[126].points["ModEna"].cvalue = 1
+
+    path = tmp_path.joinpath("scan_cache.json")
+    cache = ssst.sunspec.scan_cache.ScanCache.load(path=path)
+    await unscanned_sunspec_client.scan(cache=cache)
+    cache.save(path=path)
+
+    identity = ssst.sunspec.scan_cache.DeviceIdentity(
+        manufacturer="EPC Power", model="CAB1000", serial_number="1234"
+    )
+    [layout] = ssst.sunspec.scan_cache.ScanCache.load(path=path).layouts.values()
+    assert layout == cache.layouts[identity]
+    assert [model.id for model in layout.models] == [1, 17, 103, 126]
+
+    fresh_client = unscanned_sunspec_client.for_unit(unit=unscanned_sunspec_client.unit)
+    requests = fresh_client.metrics.snapshot().reads.requests
+    await fresh_client.scan(cache=cache)
+
+    server_device = sunspec_server.server.slave_context.sunspec_device
+    client_device = fresh_client.sunspec_device
+    assert [model.model_addr for model in client_device.model_list] == [
+        40_002,
+        40_070,
+        40_084,
+        40_136,
+    ]
+    assert client_device.get_mb() == server_device.get_mb()
+    assert fresh_client.metrics.snapshot().reads.requests - requests == 4
+
+
+async def test_scan_cache_ignores_other_device(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    identity = ssst.sunspec.scan_cache.DeviceIdentity(
+        manufacturer="", model="", serial_number="other"
+    )
+    layout = ssst.sunspec.scan_cache.DeviceLayout(
+        base_address=40_000,
+        models=(ssst.sunspec.scan_cache.ModelLayout(id=1, address=40_002, length=66),),
+    )
+    cache = ssst.sunspec.scan_cache.ScanCache(layouts={identity: layout})
+
+    await unscanned_sunspec_client.scan(cache=cache)
+
+    assert [
+        model.model_id for model in unscanned_sunspec_client.sunspec_device.model_list
+    ] == [1, 17, 103, 126]
+    assert len(cache.layouts) == 2
+
+
+async def test_scan_cache_ignores_mismatched_model_headers(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    cache = ssst.sunspec.scan_cache.ScanCache()
+    await unscanned_sunspec_client.scan(cache=cache)
+
+    [(identity, layout)] = cache.layouts.items()
+    common, serial, inverter, volt_var = layout.models
+    cache.layouts[identity] = attr.evolve(
+        layout,
+        models=(
+            common,
+            attr.evolve(serial, length=inverter.length),
+            attr.evolve(
+                inverter,
+                address=serial.address + 2 + inverter.length,
+                length=serial.length,
+            ),
+            volt_var,
+        ),
+    )
+    assert cache.layouts[identity].end_address == layout.end_address
+
+    fresh_client = unscanned_sunspec_client.for_unit(unit=unscanned_sunspec_client.unit)
+    await fresh_client.scan(cache=cache)
+
+    server_device = sunspec_server.server.slave_context.sunspec_device
+    client_device = fresh_client.sunspec_device
+    assert [
+        (model.model_id, model.model_addr) for model in client_device.model_list
+    ] == [(1, 40_002), (17, 40_070), (103, 40_084), (126, 40_136)]
+    assert client_device.get_mb() == server_device.get_mb()
+    assert cache.layouts[identity] == layout
+
+
+@pytest.mark.parametrize(
+    argnames=["policy"],
+    argvalues=[
+        [ssst.sunspec.client.ScaleFactorPolicy.Forever],
+        [ssst.sunspec.client.ScaleFactorPolicy.TimeToLive],
+        [ssst.sunspec.client.ScaleFactorPolicy.ModelRead],
+    ],
+)
+async def test_read_point_uses_cached_scale_factor(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+    policy: ssst.sunspec.client.ScaleFactorPolicy,
+) -> None:
+    sunspec_client.scale_factor_policy = policy
+
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+    server_model.points["W"].cvalue = 273
+
+    client_model = sunspec_client[103]
+    point = client_model.points["W"]
+    await sunspec_client.read_model(model=client_model)
+
+    server_model.points["W_SF"].cvalue = -1
+
+    assert await sunspec_client.read_point(point=point) == 273
+    assert point.sf_value == -2
+
+    sunspec_client.invalidate_scale_factors(model=client_model)
+
+    await sunspec_client.read_point(point=point)
+    assert point.sf_value == -1
+
+
+@pytest.mark.parametrize(
+    argnames=["policy"],
+    argvalues=[
+        [ssst.sunspec.client.ScaleFactorPolicy.Forever],
+        [ssst.sunspec.client.ScaleFactorPolicy.TimeToLive],
+    ],
+)
+async def test_read_points_updates_all_scale_factor_dependents(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+    policy: ssst.sunspec.client.ScaleFactorPolicy,
+) -> None:
+    sunspec_client.scale_factor_policy = policy
+
+    server_model = sunspec_server.server[103]
+    server_model.points["A_SF"].cvalue = -2
+    client_model = sunspec_client[103]
+    await sunspec_client.read_model(model=client_model)
+
+    server_model.points["A_SF"].cvalue = -1
+    server_model.points["A"].value = 150
+    server_model.points["AphA"].value = 70
+
+    assert await sunspec_client.read_points(points=[client_model.points["A"]]) == [15]
+    assert await sunspec_client.read_point(point=client_model.points["AphA"]) == 7
+
+
+async def test_read_points_keeps_changed_scale_factor_dependents(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["A_SF"].cvalue = -2
+    client_model = sunspec_client[103]
+    await sunspec_client.read_model(model=client_model)
+
+    phase_current = client_model.points["AphA"]
+    phase_current.cvalue = 7
+    server_model.points["A_SF"].cvalue = -1
+
+    await sunspec_client.read_points(points=[client_model.points["A"]])
+
+    assert phase_current.cvalue == 7
+    assert sunspec_client.dirty_points() == [phase_current]
+
+    await sunspec_client.flush()
+
+    assert server_model.points["AphA"].value == 70
+    assert server_model.points["AphA"].cvalue == 7
+
+
+async def test_read_point_reads_scale_factor_by_default(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+    server_model.points["W"].cvalue = 273
+
+    client_model = sunspec_client[103]
+    point = client_model.points["W"]
+    await sunspec_client.read_model(model=client_model)
+
+    server_model.points["W_SF"].cvalue = -1
+
+    await sunspec_client.read_point(point=point)
+    assert point.sf_value == -1
+
+
+async def test_scale_factor_index_includes_repeating_groups(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    model = sunspec_client[126]
+
+    index = sunspec_client.scale_factor_index(model=model)
+
+    curve_voltages = [curve.points["V1"] for curve in model.groups["curve"]]
+    assert set(index) == {"V_SF", "DeptRef_SF", "RmpIncDec_SF"}
+    assert all(point in index["V_SF"] for point in curve_voltages)
+
+
+async def test_read_scale_factor_updates_repeating_group_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_server.server[126].points["V_SF"].cvalue = -1
+
+    model = sunspec_client[126]
+    await sunspec_client.read_point(point=model.points["V_SF"])
+
+    assert all(curve.points["V1"].sf_value == -1 for curve in model.groups["curve"])
+
+
+async def test_pipelined_reads_match_sequential_reads(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+    sunspec_server.server[126].points["ModEna"].cvalue = 1
+
+    pipelined_client = attr.evolve(sunspec_client, pipeline_window=4)
+
+    address = sunspec_client.sunspec_device.base_addr
+    count = 2 + len(sunspec_server.server.slave_context.sunspec_device.get_mb()) // 2
+    sequential_bytes = await sunspec_client.read_chunked_registers(
+        address=address, count=count
+    )
+    pipelined_bytes = await pipelined_client.read_chunked_registers(
+        address=address, count=count
+    )
+
+    assert pipelined_bytes == sequential_bytes
+    assert len(pipelined_bytes) == 2 * count
+
+
+async def test_pipelined_read_raises_modbus_error(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    pipelined_client = attr.evolve(sunspec_client, pipeline_window=4)
+
+    with pytest.raises(ssst.ModbusError):
+        await pipelined_client.read_chunked_registers(address=40_300, count=250)
+
+
+async def test_for_unit_has_separate_device(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+
+    unit_client = sunspec_client.for_unit(unit=2)
+
+    assert unit_client.unit == 2
+    assert unit_client.protocol is sunspec_client.protocol
+    assert unit_client.sunspec_device is not sunspec_client.sunspec_device
+    assert unit_client.sunspec_device.model_list == []
+
+    await unit_client.scan()
+
+    assert unit_client[1] is not sunspec_client[1]
+    assert unit_client[1].points["DA"].cvalue == 43928
+
+
+async def test_write_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[126]
+    server_model.points["V_SF"].cvalue = 0
+    server_model.points["DeptRef_SF"].cvalue = 0
+
+    client_model = sunspec_client[126]
+    await sunspec_client.read_model(model=client_model)
+    server_model.points["V_SF"].cvalue = -1
+
+    [curve, *_] = client_model.groups["curve"]
+    points = []
+    for number in range(1, 5):
+        voltage = curve.points[f"V{number}"]
+        voltage.cvalue = 90 + 10 * number
+        reactive_power = curve.points[f"VAr{number}"]
+        reactive_power.cvalue = 50 - 20 * number
+        points.extend([voltage, reactive_power])
+
+    client_model.points["ModEna"].cvalue = 1
+    points.append(client_model.points["ModEna"])
+
+    await sunspec_client.write_points(points=points)
+
+    [server_curve, *_] = server_model.groups["curve"]
+    for number in range(1, 5):
+        assert server_curve.points[f"V{number}"].value == 10 * (90 + 10 * number)
+        assert server_curve.points[f"VAr{number}"].value == 50 - 20 * number
+    assert server_model.points["ModEna"].value == 1
+    assert client_model.points["V_SF"].cvalue == -1
+
+
+async def test_write_points_uses_written_scale_factor(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+    server_model.points["W"].cvalue = 100
+
+    client_model = sunspec_client[103]
+    await sunspec_client.read_model(model=client_model)
+
+    scale_factor_point = client_model.points["W_SF"]
+    point = client_model.points["W"]
+    scale_factor_point.cvalue = 0
+    point.cvalue = 150
+
+    await sunspec_client.write_points(points=[point, scale_factor_point])
+
+    assert scale_factor_point.cvalue == 0
+    assert point.cvalue == 150
+    assert point.value == 150
+    assert server_model.points["W_SF"].cvalue == 0
+    assert server_model.points["W"].value == 150
+    assert server_model.points["W"].cvalue == 150
+
+
+async def test_write_points_ignores_unwritten_local_scale_factor(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -2
+    server_model.points["W"].cvalue = 100
+
+    client_model = sunspec_client[103]
+    await sunspec_client.read_model(model=client_model)
+
+    client_model.points["W_SF"].cvalue = 0
+    point = client_model.points["W"]
+    point.cvalue = 150
+
+    await sunspec_client.write_points(points=[point])
+
+    assert point.cvalue == 150
+    assert server_model.points["W_SF"].cvalue == -2
+    assert server_model.points["W"].value == 15000
+    assert server_model.points["W"].cvalue == 150
+
+
+async def test_flush_writes_only_changed_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    await sunspec_client.read_models()
+    assert sunspec_client.dirty_points() == []
+
+    sunspec_server.server[1].points["DA"].cvalue = 17
+    sunspec_server.server[103].points["W_SF"].cvalue = -2
+    sunspec_server.server[103].points["W"].cvalue = 100
+
+    client_device_address = sunspec_client[1].points["DA"]
+    client_watts = sunspec_client[103].points["W"]
+    client_watts_scale_factor = sunspec_client[103].points["W_SF"]
+    client_watts_scale_factor.cvalue = 0
+    client_watts.cvalue = 150
+    client_mode = sunspec_client[126].points["ModEna"]
+    client_mode.cvalue = 1
+
+    assert sunspec_client.dirty_points() == [
+        client_watts,
+        client_watts_scale_factor,
+        client_mode,
+    ]
+
+    await sunspec_client.flush()
+
+    assert sunspec_client.dirty_points() == []
+    assert sunspec_server.server[1].points["DA"].cvalue == 17
+    assert client_device_address.cvalue != 17
+    assert sunspec_server.server[103].points["W_SF"].cvalue == 0
+    assert sunspec_server.server[103].points["W"].cvalue == 150
+    assert sunspec_server.server[126].points["ModEna"].cvalue == 1
+
+    server_model = sunspec_server.server[103]
+    client_model = sunspec_client[103]
+    for name in ["W", "W_SF"]:
+        assert server_model.points[name].get_mb() == client_model.points[name].get_mb()
+
+
+async def test_read_point_uses_fresh_local_value(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_point = sunspec_server.server[1].points["DA"]
+    server_point.cvalue = 17
+
+    point = sunspec_client[1].points["DA"]
+    assert await sunspec_client.read_point(point=point) == 17
+
+    server_point.cvalue = 18
+    assert await sunspec_client.read_point(point=point, max_age=60) == 17
+    assert await sunspec_client.read_point(point=point) == 18
+
+    server_point.cvalue = 19
+    sunspec_client.max_ages[point.model] = 60
+    assert await sunspec_client.read_point(point=point) == 18
+    sunspec_client.max_ages[point] = 0
+    assert await sunspec_client.read_point(point=point) == 19
+
+    server_point.cvalue = 20
+    point.cvalue = 0
+    assert await sunspec_client.read_point(point=point, max_age=60) == 20
+
+
+async def test_read_point_reads_static_points_once(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_point = sunspec_server.server[1].points["SN"]
+    point = sunspec_client[1].points["SN"]
+    original = await sunspec_client.read_point(point=point)
+
+    server_point.cvalue = "changed"
+    assert await sunspec_client.read_point(point=point) == original
+    await sunspec_client.read_point(point=point, max_age=0)
+    assert point.cvalue == "changed"
+
+
+async def test_read_point_reads_never_read_static_point(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_server.server[1].points["SN"].cvalue = "1234"
+
+    model = sunspec2.modbus.client.SunSpecModbusClientModel(model_id=1)
+    model.model_addr = 40_002
+    unscanned_sunspec_client.sunspec_device.add_model(model)
+
+    assert await unscanned_sunspec_client.read_point(point=model.points["SN"]) == "1234"
+    assert unscanned_sunspec_client.metrics.snapshot().reads.requests == 1
+
+
+async def test_read_registers_updates_local_data(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = -1
+    server_model.points["W"].cvalue = 150
+    server_model.points["WH_SF"].cvalue = 0
+    server_model.points["WH"].cvalue = 70000
+
+    model = sunspec_client[103]
+    watts = model.points["W"]
+    watt_hours = model.points["WH"]
+    watt_hours_address = sunspec_client.point_address(point=watt_hours)
+
+    await sunspec_client.read_chunked_registers(
+        address=model.model_addr,
+        count=watt_hours_address + 1 - model.model_addr,
+        update=True,
+    )
+
+    assert watts.cvalue == 150
+    assert watts.sf_value == -1
+    assert watt_hours.cvalue != 70000
+
+    await sunspec_client.read_registers(
+        address=watt_hours_address, count=watt_hours.len + 1, update=True
+    )
+
+    assert watt_hours.cvalue == 70000
+
+
+@pytest.mark.parametrize(
+    argnames=["address", "count", "expected_names"],
+    argvalues=[
+        [0, 1, ["ID"]],
+        [14, 1, ["W"]],
+        [14, 2, ["W", "W_SF"]],
+        [13, 3, ["V_SF", "W", "W_SF"]],
+        [25, 1, ["WH"]],
+        [25, 2, ["WH", "WH_SF"]],
+        [23, 2, ["PF_SF", "WH"]],
+    ],
+)
+def test_point_address_index_overlapping(
+    address: int, count: int, expected_names: typing.List[str]
+) -> None:
+    model = sunspec2.modbus.client.SunSpecModbusClientModel(model_id=103)
+    model.model_addr = 0
+    index = ssst.sunspec.PointAddressIndex.build(models=[model])
+
+    points = index.overlapping(address=address, count=count)
+
+    assert [point.pdef["name"] for point in points] == expected_names
+
+
+@attr.s(auto_attribs=True)
+class _GatedProtocol:
+    """Holds reads until released and records them."""
+
+    protocol: pymodbus.client.common.ModbusClientMixin
+    release: trio.Event = attr.ib(factory=trio.Event)
+    reads: typing.List[typing.Tuple[int, int]] = attr.ib(factory=list)
+
+    async def read_holding_registers(
+        self, address: int, count: int, unit: int
+    ) -> object:
+        self.reads.append((address, count))
+        await self.release.wait()
+        return await self.protocol.read_holding_registers(
+            address=address, count=count, unit=unit
+        )
+
+    async def write_registers(self, address: int, values: bytes, unit: int) -> object:
+        return await self.protocol.write_registers(
+            address=address, values=values, unit=unit
+        )
+
+
+async def test_contained_reads_share_in_flight_read(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    address = sunspec_client[103].model_addr
+    expected = await sunspec_client.read_registers(address=address, count=50)
+
+    protocol = _GatedProtocol(protocol=sunspec_client.protocol)
+    gated_client = attr.evolve(sunspec_client, protocol=protocol)
+    results: typing.Dict[typing.Tuple[int, int], bytes] = {}
+
+    async def read(offset: int, count: int) -> None:
+        results[offset, count] = await gated_client.read_registers(
+            address=address + offset, count=count
+        )
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(read, 0, 50)
+        await trio.testing.wait_all_tasks_blocked()
+        nursery.start_soon(read, 10, 5)
+        nursery.start_soon(read, 0, 50)
+        await trio.testing.wait_all_tasks_blocked()
+        protocol.release.set()
+
+    assert protocol.reads == [(address, 50)]
+    assert results == {
+        (0, 50): expected,
+        (10, 5): expected[20:30],
+    }
+
+
+async def test_contained_read_retries_after_in_flight_read_is_rejected(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    last_model = sunspec_client.sunspec_device.model_list[-1]
+    address = last_model.model_addr + 2 + last_model.model_len - 10
+    expected = await sunspec_client.read_registers(address=address, count=4)
+
+    protocol = _GatedProtocol(protocol=sunspec_client.protocol)
+    gated_client = attr.evolve(sunspec_client, protocol=protocol)
+    results: typing.Dict[int, typing.Union[bytes, Exception]] = {}
+
+    async def read(count: int) -> None:
+        try:
+            results[count] = await gated_client.read_registers(
+                address=address, count=count
+            )
+        except ssst.ModbusError as error:
+            results[count] = error
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(read, 100)
+        await trio.testing.wait_all_tasks_blocked()
+        nursery.start_soon(read, 4)
+        await trio.testing.wait_all_tasks_blocked()
+        protocol.release.set()
+
+    assert protocol.reads == [(address, 100), (address, 4)]
+    assert isinstance(results[100], ssst.ModbusError)
+    assert results[4] == expected
+
+
+async def test_read_after_write_does_not_share_earlier_in_flight_read(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    model = sunspec_client[1]
+    point = model.points["DA"]
+
+    protocol = _GatedProtocol(protocol=sunspec_client.protocol)
+    gated_client = attr.evolve(sunspec_client, protocol=protocol)
+    results: typing.List[ssst.sunspec.client.Value] = []
+
+    async def read_point() -> None:
+        results.append(await gated_client.read_point(point=point))
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(
+            gated_client.read_registers, model.model_addr, 2 + model.model_len
+        )
+        await trio.testing.wait_all_tasks_blocked()
+        point.cvalue = 77
+        await gated_client.write_point(point=point)
+        nursery.start_soon(read_point)
+        await trio.testing.wait_all_tasks_blocked()
+        protocol.release.set()
+
+    assert protocol.reads == [
+        (model.model_addr, 2 + model.model_len),
+        (gated_client.point_address(point=point), 1),
+    ]
+    assert results == [77]
+    assert sunspec_server.server[1].points["DA"].cvalue == 77
+
+
+@attr.s(auto_attribs=True)
+class _LimitedProtocol:
+    """Rejects reads of more than the maximum count and records the read counts."""
+
+    protocol: pymodbus.client.common.ModbusClientMixin
+    max_count: int
+    counts: typing.List[int] = attr.ib(factory=list)
+
+    async def read_holding_registers(
+        self, address: int, count: int, unit: int
+    ) -> object:
+        self.counts.append(count)
+        if count > self.max_count:
+            return pymodbus.pdu.ExceptionResponse(
+                function_code=0x03,
+                exception_code=pymodbus.pdu.ModbusExceptions.IllegalValue,
+            )
+
+        return await self.protocol.read_holding_registers(
+            address=address, count=count, unit=unit
+        )
+
+
+async def test_scan_probes_max_read_count(
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    protocol = _LimitedProtocol(
+        protocol=unscanned_sunspec_client.protocol, max_count=40
+    )
+    limited_client = attr.evolve(unscanned_sunspec_client, protocol=protocol)
+
+    await limited_client.scan(probe_max_read_count=True)
+
+    assert limited_client.max_read_count == 40
+
+    protocol.counts.clear()
+    await limited_client.read_models()
+
+    assert max(protocol.counts) == 40
+
+
+async def test_scan_cache_probes_max_read_count_before_bulk_reads(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    unscanned_sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    cache = ssst.sunspec.scan_cache.ScanCache()
+    await unscanned_sunspec_client.scan(cache=cache)
+    [layout] = cache.layouts.values()
+
+    protocol = _LimitedProtocol(
+        protocol=unscanned_sunspec_client.protocol, max_count=40
+    )
+    limited_client = attr.evolve(
+        unscanned_sunspec_client.for_unit(unit=unscanned_sunspec_client.unit),
+        protocol=protocol,
+    )
+
+    await limited_client.scan(cache=cache, probe_max_read_count=True)
+
+    assert limited_client.max_read_count == 40
+    server_device = sunspec_server.server.slave_context.sunspec_device
+    assert limited_client.sunspec_device.get_mb() == server_device.get_mb()
+
+    models_count = layout.end_address + 1 - layout.models[1].address
+    assert protocol.counts == [
+        2,
+        *[125, 62, 31, 46, 38, 42, 40, 41],
+        40,
+        30,
+        *[min(40, models_count - offset) for offset in range(0, models_count, 40)],
+    ]
+
+
+async def test_probe_max_read_count_raises_when_nothing_is_accepted(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    protocol = _LimitedProtocol(protocol=sunspec_client.protocol, max_count=0)
+    limited_client = attr.evolve(sunspec_client, protocol=protocol)
+
+    with pytest.raises(ssst.ModbusError):
+        await limited_client.probe_max_read_count()
+
+    assert limited_client.max_read_count == ssst.sunspec.client.max_read_registers
+
+
+async def test_memory_client_communicates_with_server(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+) -> None:
+    sunspec_server.server[1].points["DA"].cvalue = 43928
+
+    async with ssst.sunspec.client.open_memory_client(
+        server=sunspec_server.server, pipeline_window=4
+    ) as client:
+        await client.scan()
+        assert client[1].points["DA"].cvalue == 43928
+
+        client[1].points["DA"].cvalue = 17
+        await client.flush()
+
+    assert sunspec_server.server[1].points["DA"].cvalue == 17
@@ -0,0 +1,63 @@
+import pytest
+
+import ssst._tests.conftest
+import ssst.sunspec.client
+import ssst.sunspec.metrics
+
+
+def test_latency_histogram_is_empty() -> None:
+    histogram = ssst.sunspec.metrics.LatencyHistogram()
+
+    assert histogram.quantile(fraction=0.5) is None
+
+
+@pytest.mark.parametrize(
+    argnames=["fraction", "expected"],
+    argvalues=[
+        [0.5, 0.001],
+        [0.9, 0.001],
+        [0.95, 0.05],
+        [0.995, 20],
+    ],
+)
+def test_latency_histogram_quantile(fraction: float, expected: float) -> None:
+    histogram = ssst.sunspec.metrics.LatencyHistogram()
+    for _ in range(90):
+        histogram.record(latency=0.0008)
+    for _ in range(9):
+        histogram.record(latency=0.03)
+    histogram.record(latency=20)
+
+    assert histogram.quantile(fraction=fraction) == expected
+
+
+def test_latency_histogram_quantile_does_not_exceed_maximum() -> None:
+    histogram = ssst.sunspec.metrics.LatencyHistogram()
+    histogram.record(latency=0.3)
+
+    assert histogram.quantile(fraction=0.5) == 0.3
+
+
+async def test_client_records_requests(
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    sunspec_client.metrics.reset()
+    model = sunspec_client[1]
+
+    await sunspec_client.read_registers(address=model.model_addr, count=10)
+    await sunspec_client.read_registers(address=model.model_addr, count=4)
+    await sunspec_client.write_point(point=model.points["DA"])
+
+    with pytest.raises(ssst.ModbusError):
+        await sunspec_client.read_registers(address=40_300, count=250)
+
+    snapshot = sunspec_client.metrics.snapshot()
+
+    assert snapshot.reads.requests == 3
+    assert snapshot.reads.registers == 14
+    assert snapshot.reads.bytes == 28
+    assert list(snapshot.reads.errors) == [3]
+    assert snapshot.reads.p50 is not None
+    assert snapshot.writes.requests == 1
+    assert snapshot.writes.registers == 1
+    assert snapshot.writes.errors == {}
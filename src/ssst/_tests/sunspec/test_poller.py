@@ -0,0 +1,255 @@
+import pytest
+import sunspec2.modbus.client
+import trio
+import trio.testing
+
+import ssst
+import ssst._tests.conftest
+import ssst.sunspec.client
+import ssst.sunspec.poller
+
+
+async def test_poll_group_results(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    sunspec_server.server[103].points["W_SF"].cvalue = -2
+    sunspec_server.server[103].points["W"].cvalue = 273
+
+    point = memory_sunspec_client[103].points["W"]
+    group = ssst.sunspec.poller.PollGroup(points=(point,), interval=0.1)
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    results = poller.add_group(group=group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        first = await results.receive()
+        sunspec_server.server[103].points["W"].cvalue = 150
+        second = await results.receive()
+
+        nursery.cancel_scope.cancel()
+
+    assert first.group is group
+    assert first.values == {point: 273}
+    assert second.values == {point: 150}
+    assert second.deadline - first.deadline == pytest.approx(0.1)
+
+
+async def test_poll_groups_share_deadlines(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    watts = memory_sunspec_client[103].points["W"]
+    device_address = memory_sunspec_client[1].points["DA"]
+    fast_group = ssst.sunspec.poller.PollGroup(points=(watts,), interval=0.1)
+    slow_group = ssst.sunspec.poller.PollGroup(
+        points=(watts, device_address), interval=0.2
+    )
+
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    fast_results = poller.add_group(group=fast_group)
+    slow_results = poller.add_group(group=slow_group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        fast_deadlines = [(await fast_results.receive()).deadline for _ in range(3)]
+        slow_deadlines = [(await slow_results.receive()).deadline for _ in range(2)]
+
+        nursery.cancel_scope.cancel()
+
+    start = fast_deadlines[0]
+    assert [deadline - start for deadline in fast_deadlines] == pytest.approx(
+        [0, 0.1, 0.2]
+    )
+    assert [deadline - start for deadline in slow_deadlines] == pytest.approx([0, 0.2])
+
+
+async def test_poller_closes_channels_when_cancelled(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    group = ssst.sunspec.poller.PollGroup(
+        points=(memory_sunspec_client[1].points["DA"],), interval=10
+    )
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    results = poller.add_group(group=group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+        await results.receive()
+        nursery.cancel_scope.cancel()
+
+    with pytest.raises(trio.EndOfChannel):
+        await results.receive()
+
+
+@pytest.mark.parametrize(
+    argnames=["deadband", "reported", "value", "expected"],
+    argvalues=[
+        [ssst.sunspec.poller.Deadband(), 10, 10, False],
+        [ssst.sunspec.poller.Deadband(), 10, 10.5, True],
+        [ssst.sunspec.poller.Deadband(absolute=1), 10, 11, False],
+        [ssst.sunspec.poller.Deadband(absolute=1), 10, 8.5, True],
+        [ssst.sunspec.poller.Deadband(percent=10), 100, 109, False],
+        [ssst.sunspec.poller.Deadband(percent=10), 100, 111, True],
+        [ssst.sunspec.poller.Deadband(absolute=5, percent=1), 100, 104, False],
+        [ssst.sunspec.poller.Deadband(absolute=100), None, 10, True],
+        [ssst.sunspec.poller.Deadband(absolute=100), "abc", "abd", True],
+    ],
+)
+def test_deadband_exceeded(
+    deadband: ssst.sunspec.poller.Deadband,
+    reported: ssst.sunspec.poller.Value,
+    value: ssst.sunspec.poller.Value,
+    expected: bool,
+) -> None:
+    assert deadband.exceeded(reported=reported, value=value) == expected
+
+
+async def test_poll_group_reports_only_changes(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    server_model = sunspec_server.server[103]
+    server_model.points["W_SF"].cvalue = 0
+    server_model.points["W"].cvalue = 100
+    server_model.points["VAr_SF"].cvalue = 0
+    server_model.points["VAr"].cvalue = 20
+
+    watts = memory_sunspec_client[103].points["W"]
+    volt_amperes_reactive = memory_sunspec_client[103].points["VAr"]
+    group = ssst.sunspec.poller.PollGroup(
+        points=(watts, volt_amperes_reactive),
+        interval=0.1,
+        deadband=ssst.sunspec.poller.Deadband(absolute=5),
+    )
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    results = poller.add_group(group=group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        first = await results.receive()
+        server_model.points["W"].cvalue = 103
+        server_model.points["VAr"].cvalue = 30
+        second = await results.receive()
+
+        nursery.cancel_scope.cancel()
+
+    assert first.values == {watts: 100, volt_amperes_reactive: 20}
+    assert second.values == {volt_amperes_reactive: 30}
+
+
+async def test_poll_group_heartbeat_reports_unchanged_values(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    point = memory_sunspec_client[1].points["DA"]
+    group = ssst.sunspec.poller.PollGroup(
+        points=(point,),
+        interval=0.1,
+        deadband=ssst.sunspec.poller.Deadband(),
+        heartbeat=0.25,
+    )
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    results = poller.add_group(group=group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        first = await results.receive()
+        second = await results.receive()
+
+        nursery.cancel_scope.cancel()
+
+    assert first.values.keys() == second.values.keys() == {point}
+    assert second.deadline - first.deadline == pytest.approx(0.3)
+
+
+async def test_poll_groups_with_inexact_intervals_share_deadlines(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    fast_group = ssst.sunspec.poller.PollGroup(
+        points=(memory_sunspec_client[103].points["W"],), interval=0.1
+    )
+    slow_group = ssst.sunspec.poller.PollGroup(
+        points=(memory_sunspec_client[1].points["DA"],), interval=0.3
+    )
+
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    fast_results = poller.add_group(group=fast_group)
+    slow_results = poller.add_group(group=slow_group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        fast_deadlines = [(await fast_results.receive()).deadline for _ in range(10)]
+        slow_deadlines = [(await slow_results.receive()).deadline for _ in range(4)]
+
+        nursery.cancel_scope.cancel()
+
+    assert slow_deadlines == fast_deadlines[::3]
+
+
+async def test_poller_reports_errors_per_group(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    missing_model = sunspec2.modbus.client.SunSpecModbusClientModel(model_id=1)
+    missing_model.model_addr = 0
+    good_group = ssst.sunspec.poller.PollGroup(
+        points=(memory_sunspec_client[1].points["DA"],), interval=0.1
+    )
+    bad_group = ssst.sunspec.poller.PollGroup(
+        points=(missing_model.points["DA"],), interval=0.1
+    )
+
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    good_results = poller.add_group(group=good_group)
+    bad_results = poller.add_group(group=bad_group)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+
+        good = [await good_results.receive() for _ in range(2)]
+        bad = [await bad_results.receive() for _ in range(2)]
+
+        nursery.cancel_scope.cancel()
+
+    assert [(result.error, len(result.values)) for result in good] == [(None, 1)] * 2
+    assert all(isinstance(result.error, ssst.ModbusError) for result in bad)
+    assert [result.values for result in bad] == [{}] * 2
+
+
+async def test_poller_continues_after_a_receiver_closes(
+    memory_sunspec_client: ssst.sunspec.client.Client,
+    autojump_clock: trio.testing.MockClock,
+) -> None:
+    poller = ssst.sunspec.poller.Poller(client=memory_sunspec_client)
+    closed_results = poller.add_group(
+        group=ssst.sunspec.poller.PollGroup(
+            points=(memory_sunspec_client[1].points["DA"],), interval=0.1
+        )
+    )
+    results = poller.add_group(
+        group=ssst.sunspec.poller.PollGroup(
+            points=(memory_sunspec_client[103].points["W"],), interval=0.1
+        )
+    )
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(poller.run)
+        await closed_results.aclose()
+
+        deadlines = [(await results.receive()).deadline for _ in range(3)]
+
+        nursery.cancel_scope.cancel()
+
+    assert [deadline - deadlines[0] for deadline in deadlines] == pytest.approx(
+        [0, 0.1, 0.2]
+    )
@@ -1,6 +1,9 @@
+import pytest
+
 import ssst._tests.conftest
 import ssst.sunspec
 import ssst.sunspec.client
+import ssst.sunspec.server
 
 
 async def test_base_address_marker(
@@ -50,3 +53,125 @@ async def test_read_bus_value_scaled_as_expected(
 
     await sunspec_client.read_point(point=client_point)
     assert client_point.value == scaled_watts / 10 ** scale_factor
+
+
+async def test_written_scale_factor_applies_to_dependent_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    server_point = sunspec_server.server[103].points["W"]
+    server_scale_factor_point = sunspec_server.server[103].points["W_SF"]
+    server_scale_factor_point.cvalue = -2
+    server_point.cvalue = 273
+
+    client_scale_factor_point = sunspec_client[103].points["W_SF"]
+    client_scale_factor_point.cvalue = -1
+    await sunspec_client.write_point(point=client_scale_factor_point)
+
+    assert server_point.sf_value == -1
+    assert server_point.value == 27300
+
+
+async def test_write_registers_within_point(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    model = sunspec_server.server[103]
+    model.points["WH_SF"].cvalue = 0
+    point = model.points["WH"]
+    point.value = 0x0001_0002
+
+    await sunspec_client.write_registers(
+        address=model.model_addr + point.offset + 1, values=b"\x00\x05"
+    )
+
+    assert point.value == 0x0001_0005
+
+    point.value = 0x0003_0004
+    register_bytes = await sunspec_client.read_registers(
+        address=model.model_addr + point.offset, count=2
+    )
+
+    assert register_bytes == b"\x00\x03\x00\x04"
+
+
+async def test_written_scale_factor_applies_to_repeating_group_points(
+    sunspec_server: ssst._tests.conftest.SunSpecServerFixtureResult,
+    sunspec_client: ssst.sunspec.client.Client,
+) -> None:
+    model = sunspec_server.server[126]
+    scale_factor_point = model.points["V_SF"]
+
+    await sunspec_client.write_registers(
+        address=model.model_addr + scale_factor_point.offset,
+        values=scale_factor_point.info.to_data(-1),
+    )
+
+    assert [curve.points["V1"].sf_value for curve in model.groups["curve"]] == [
+        -1
+    ] * len(model.groups["curve"])
+
+
+def test_validate_uses_device_base_address() -> None:
+    server = ssst.sunspec.server.Server.build(
+        model_summaries=[ssst.sunspec.server.ModelSummary(id=1, length=66)],
+        base_address=50_000,
+    )
+    context = server.slave_context
+    end_address = 50_000 + 2 + 2 + 66 + 2
+
+    assert context.end_address == end_address
+    assert context.validate(fx=3, address=50_000, count=4)
+    assert context.validate(fx=3, address=end_address - 2, count=2)
+    assert not context.validate(fx=3, address=end_address - 1, count=2)
+    assert not context.validate(fx=3, address=40_000, count=1)
+    assert context.getValues(fx=3, address=end_address - 2, count=2) == (
+        b"\xff\xff\x00\x00"
+    )
+
+
+def test_get_values_shares_register_image() -> None:
+    server = ssst.sunspec.server.Server.build(
+        model_summaries=[ssst.sunspec.server.ModelSummary(id=1, length=66)],
+    )
+    context = server.slave_context
+
+    values = context.getValues(fx=3, address=40_000, count=2)
+
+    assert isinstance(values, memoryview)
+    assert values.obj is context.register_image
+    assert values == ssst.sunspec.base_address_sentinel
+
+
+async def test_multiple_devices_served_by_unit() -> None:
+    server = ssst.sunspec.server.Server.build_multiple(
+        unit_model_summaries={
+            unit: [
+                ssst.sunspec.server.ModelSummary(id=1, length=66),
+                ssst.sunspec.server.ModelSummary(id=model_id, length=50),
+            ]
+            for unit, model_id in [(3, 103), (1, 101)]
+        },
+    )
+    assert server.slave_context is server.slave_contexts[1]
+
+    for unit in [1, 3]:
+        server.for_unit(unit=unit)[1].points["DA"].cvalue = unit
+
+    async with ssst.sunspec.client.open_memory_client(server=server) as client:
+        for unit, model_id in [(1, 101), (3, 103)]:
+            unit_client = client.for_unit(unit=unit)
+            await unit_client.scan()
+
+            assert unit_client[1].points["DA"].cvalue == unit
+            assert [
+                model.model_id for model in unit_client.sunspec_device.model_list
+            ] == [
+                1,
+                model_id,
+            ]
+
+
+def test_build_multiple_raises_without_units() -> None:
+    with pytest.raises(ValueError, match="^At least one unit is required$"):
+        ssst.sunspec.server.Server.build_multiple(unit_model_summaries={})
@@ -1 +1,125 @@
+import bisect
+import typing
+
+import attr
+import sunspec2.modbus.client
+
+
 base_address_sentinel = b"SunS"
+
+
+ScaleFactorIndex = typing.Dict[
+    str, typing.List[sunspec2.modbus.client.SunSpecModbusClientPoint]
+]
+"""Maps the name of each scale factor point in a model to the points scaled by it."""
+
+
+def build_scale_factor_index(
+    model: sunspec2.modbus.client.SunSpecModbusClientModel,
+) -> ScaleFactorIndex:
+    """Build the reverse index from scale factor point names to the points, including
+    those in nested and repeating groups, which depend on them.
+
+    Arguments:
+        model: The SunSpec model object to index.
+
+    Returns:
+        The index.  Scale factor points with no dependent points are included.
+    """
+    index: ScaleFactorIndex = {}
+
+    for point in iterate_points(group=model):
+        if point.pdef["type"] == "sunssf":
+            index.setdefault(point.pdef["name"], [])
+
+    for point in iterate_points(group=model):
+        if point.sf is not None:
+            index.setdefault(point.sf, []).append(point)
+
+    return index
+
+
+def iterate_points(
+    group: sunspec2.modbus.client.SunSpecModbusClientGroup,
+) -> typing.Iterator[sunspec2.modbus.client.SunSpecModbusClientPoint]:
+    """Iterate over all points in the passed group, including those in nested and
+    repeating groups, in register order.
+
+    Arguments:
+        group: The SunSpec group or model object to iterate over.
+
+    Yields:
+        Each SunSpec point object.
+    """
+    yield from group.points.values()
+
+    for subgroup in group.groups.values():
+        if isinstance(subgroup, list):
+            for repetition in subgroup:
+                yield from iterate_points(group=repetition)
+        else:
+            yield from iterate_points(group=subgroup)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class PointAddressIndex:
+    """Finds the points located in a register range.  Points are expected not to
+    overlap one another, as is the case for the models of a single device.
+    """
+
+    addresses: typing.List[int]
+    """The address of the first register of each point, in ascending order."""
+    points: typing.List[sunspec2.modbus.client.SunSpecModbusClientPoint]
+    """The point located at each of the :attr:`PointAddressIndex.addresses`."""
+
+    @classmethod
+    def build(
+        cls,
+        models: typing.Iterable[sunspec2.modbus.client.SunSpecModbusClientModel],
+    ) -> "PointAddressIndex":
+        """Build the index of all points, including those in nested and repeating
+        groups, of the passed models.
+
+        Arguments:
+            models: The SunSpec model objects to index.
+
+        Returns:
+            The index.
+        """
+        located_points: typing.List[
+            typing.Tuple[int, sunspec2.modbus.client.SunSpecModbusClientPoint]
+        ] = sorted(
+            (
+                (int(model.model_addr + point.offset), point)
+                for model in models
+                for point in iterate_points(group=model)
+            ),
+            key=lambda located_point: located_point[0],
+        )
+
+        return cls(
+            addresses=[address for address, point in located_points],
+            points=[point for address, point in located_points],
+        )
+
+    def overlapping(
+        self, address: int, count: int
+    ) -> typing.List[sunspec2.modbus.client.SunSpecModbusClientPoint]:
+        """Find the points with at least one register in the passed range.
+
+        Arguments:
+            address: The first register of the range.
+            count: The number of registers in the range.
+
+        Returns:
+            The SunSpec point objects, in register order.
+        """
+        end = address + count
+        start_index = bisect.bisect_right(self.addresses, address) - 1
+        if start_index < 0 or (
+            self.addresses[start_index] + self.points[start_index].len <= address
+        ):
+            start_index += 1
+        end_index = bisect.bisect_left(self.addresses, end)
+
+        return self.points[start_index:end_index]
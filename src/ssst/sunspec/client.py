@@ -1,3 +1,5 @@
+import enum
+import math
 import typing
 
 import async_generator
@@ -9,17 +11,75 @@ import pymodbus.client.common
 import sunspec2.mb
 import sunspec2.modbus.client
 import pymodbus.pdu
+import trio
+import trio.testing
 
 import ssst.sunspec
+import ssst.sunspec.metrics
+import ssst.sunspec.scan_cache
+import ssst.sunspec.stream
+
+if typing.TYPE_CHECKING:
+    import ssst.sunspec.server
+
+
+max_read_registers = 125
+"""The Modbus limit on the number of holding registers that can be read by a single
+request."""
+
+max_write_registers = 123
+"""The Modbus limit on the number of holding registers that can be written by a single
+request."""
+
+
+Value = typing.Union[float, int, str, None]
+"""A computed point value as reported by ``pysunspec2``."""
+
+
+static_point_names = {1: frozenset({"Mn", "Md", "SN"})}
+"""The names of the points, by model ID, that never change for the life of a
+connection.  Unless overridden in :attr:`Client.max_ages`, :meth:`Client.read_point`
+only reads them from the device once."""
+
+
+class ScaleFactorPolicy(enum.Enum):
+    """Policies for when :meth:`Client.read_point` and :meth:`Client.write_point` read
+    the scale factor of a point from the device rather than using the local value.
+    Any read of a scale factor point refreshes its local value regardless of policy.
+    See also :meth:`Client.invalidate_scale_factors`.
+    """
+
+    Always = "always"
+    """Read the scale factor along with every point."""
+
+    Forever = "forever"
+    """Read each scale factor only until it has been read once."""
+
+    TimeToLive = "time to live"
+    """Read each scale factor only if it has not been read within
+    :attr:`Client.scale_factor_time_to_live` seconds."""
+
+    ModelRead = "model read"
+    """Read each scale factor only if its model has not been read as a whole by
+    :meth:`Client.scan`, :meth:`Client.read_model`, or :meth:`Client.read_models`."""
 
 
 @async_generator.asynccontextmanager
-async def open_client(host: str, port: int) -> typing.AsyncIterator["Client"]:
-    """Open a SunSpec Modbus TCP connection to the passed host and port.
+async def open_client(
+    host: str,
+    port: int,
+    pipeline_window: typing.Optional[int] = None,
+    unit: int = 0x01,
+) -> typing.AsyncIterator["Client"]:
+    """Open a SunSpec Modbus TCP connection to the passed host and port.  Devices at
+    other unit IDs on the same connection can be reached using
+    :meth:`Client.for_unit`.
 
     Arguments:
         host: The host name or IP address.
         port: The port number.
+        pipeline_window: See :attr:`Client.pipeline_window`.
+        unit: See :attr:`Client.unit`.
 
     Yields:
         The SunSpec client.
@@ -37,8 +97,83 @@ async def open_client(host: str, port: int) -> typing.AsyncIterator["Client"]:
             modbus_client=modbus_client,
             sunspec_device=sunspec_device,
             protocol=protocol,
+            pipeline_window=pipeline_window,
+            unit=unit,
+        )
+
+
+@async_generator.asynccontextmanager
+async def open_stream_client(
+    stream: trio.abc.Stream,
+    pipeline_window: typing.Optional[int] = None,
+    unit: int = 0x01,
+) -> typing.AsyncIterator["Client"]:
+    """Open a SunSpec Modbus TCP connection over the passed stream, such as a TLS
+    stream or one half of an in-memory stream pair.  The stream is not closed on
+    exit.
+
+    Arguments:
+        stream: The stream to communicate over.
+        pipeline_window: See :attr:`Client.pipeline_window`.
+        unit: See :attr:`Client.unit`.
+
+    Yields:
+        The SunSpec client.
+    """
+    protocol = ssst.sunspec.stream.StreamProtocol(stream=stream)
+
+    async with trio.open_nursery() as nursery:
+        await nursery.start(protocol.receive)
+
+        yield Client(
+            modbus_client=None,
+            sunspec_device=sunspec2.modbus.client.SunSpecModbusClientDevice(),
+            protocol=protocol,
+            pipeline_window=pipeline_window,
+            unit=unit,
         )
 
+        nursery.cancel_scope.cancel()
+
+
+@async_generator.asynccontextmanager
+async def open_memory_client(
+    server: "ssst.sunspec.server.Server",
+    pipeline_window: typing.Optional[int] = None,
+    unit: int = 0x01,
+) -> typing.AsyncIterator["Client"]:
+    """Open a SunSpec Modbus TCP connection to the passed server within this process
+    through an in-memory stream pair.  Requests are framed and served as they would
+    be over TCP, but no sockets are involved.
+
+    .. code-block:: python
+
+        async with open_memory_client(server=server) as client:
+            await client.scan()
+
+    Arguments:
+        server: The server to connect to.
+        pipeline_window: See :attr:`Client.pipeline_window`.
+        unit: See :attr:`Client.unit`.
+
+    Yields:
+        The SunSpec client.
+    """
+    client_stream, server_stream = trio.testing.memory_stream_pair()
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(server.tcp_server, server_stream)
+
+        async with open_stream_client(
+            stream=client_stream,
+            pipeline_window=pipeline_window,
+            unit=unit,
+        ) as client:
+            yield client
+
+        await client_stream.aclose()
+        nursery.cancel_scope.cancel()
+
 
 @attr.s(auto_attribs=True)
 class Client:
@@ -50,13 +185,113 @@ class Client:
     .. automethod:: __getitem__
     """
 
-    modbus_client: pymodbus.client.asynchronous.trio.TrioModbusTcpClient
-    """The Modbus TCP client used for communication."""
-    protocol: pymodbus.client.common.ModbusClientMixin
+    modbus_client: typing.Optional[
+        pymodbus.client.asynchronous.trio.TrioModbusTcpClient
+    ]
+    """The Modbus TCP client used for communication, or :obj:`None` when communicating
+    over another stream with :func:`open_stream_client`."""
+    protocol: typing.Union[
+        pymodbus.client.common.ModbusClientMixin,
+        ssst.sunspec.stream.StreamProtocol,
+    ]
     """The Modbus client protocol."""
     sunspec_device: sunspec2.modbus.client.SunSpecModbusClientDevice
     """The SunSpec device object that holds the local data cache and model structures.
     """
+    unit: int = 0x01
+    """The Modbus unit ID of the device, used for all requests."""
+    pipeline_window: typing.Optional[int] = None
+    """The largest number of requests to have outstanding on the connection at once.
+    When set, multi-request operations such as :meth:`Client.read_chunked_registers`
+    and :meth:`Client.execute_read_plan` send their requests concurrently within this
+    window instead of waiting for each response before sending the next request.
+    :obj:`None` leaves requests from concurrent tasks unlimited and multi-request
+    operations sequential.  Only the devices that accept several outstanding Modbus
+    TCP transactions should be used with a window larger than one."""
+    scale_factor_policy: ScaleFactorPolicy = ScaleFactorPolicy.Always
+    """When to read scale factors for individual point reads and writes."""
+    scale_factor_time_to_live: float = 60
+    """The time in seconds that a scale factor is used for with the
+    :attr:`ScaleFactorPolicy.TimeToLive` policy."""
+    max_read_count: int = max_read_registers
+    """The largest number of registers to read in a single request when splitting
+    larger reads, such as for :meth:`Client.read_chunked_registers` and read plans.
+    Some devices reject reads well short of the Modbus limit.  See
+    :meth:`Client.probe_max_read_count`."""
+    max_ages: typing.Dict[
+        typing.Union[
+            sunspec2.modbus.client.SunSpecModbusClientPoint,
+            sunspec2.modbus.client.SunSpecModbusClientModel,
+        ],
+        float,
+    ] = attr.ib(factory=dict)
+    """The default age in seconds up to which :meth:`Client.read_point` returns the
+    local value of a point rather than reading it from the device, keyed by SunSpec
+    point or model object.  A point's own entry takes precedence over its model's.
+    Points without either are read every time, except for those listed in
+    :data:`static_point_names`."""
+    metrics: ssst.sunspec.metrics.ClientMetrics = attr.ib(
+        factory=ssst.sunspec.metrics.ClientMetrics, init=False
+    )
+    """The request counts and latencies of this client's device."""
+    _scale_factor_read_times: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientPoint, float
+    ] = attr.ib(factory=dict, init=False, repr=False)
+    _scale_factor_read_models: typing.Set[
+        sunspec2.modbus.client.SunSpecModbusClientModel
+    ] = attr.ib(factory=set, init=False, repr=False)
+    _scale_factor_indexes: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientModel,
+        ssst.sunspec.ScaleFactorIndex,
+    ] = attr.ib(factory=dict, init=False, repr=False)
+    _point_read_times: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientPoint, float
+    ] = attr.ib(factory=dict, init=False, repr=False)
+    _model_read_times: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientModel, float
+    ] = attr.ib(factory=dict, init=False, repr=False)
+    _point_address_index: typing.Optional[ssst.sunspec.PointAddressIndex] = attr.ib(
+        default=None, init=False, repr=False
+    )
+    _in_flight_reads: typing.List["_InFlightRead"] = attr.ib(
+        factory=list, init=False, repr=False
+    )
+    _in_flight: typing.Optional[trio.CapacityLimiter] = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        if self.pipeline_window is None:
+            self._in_flight = None
+        else:
+            self._in_flight = trio.CapacityLimiter(self.pipeline_window)
+
+    def for_unit(self, unit: int) -> "Client":
+        """Create a client for the device at another unit ID on the same connection,
+        such as another inverter behind a Modbus TCP gateway.  The new client has its
+        own SunSpec device object, and thus its own scan, models, and caches, but
+        shares the connection and its :attr:`Client.pipeline_window`.
+
+        .. code-block:: python
+
+            async with open_client(host=host, port=port, unit=1) as client:
+                clients = [client, *(client.for_unit(unit=unit) for unit in [2, 3])]
+                for client in clients:
+                    await client.scan()
+
+        Arguments:
+            unit: The Modbus unit ID of the device.
+
+        Returns:
+            The client for the device at the passed unit ID.
+        """
+        client = attr.evolve(
+            self,
+            sunspec_device=sunspec2.modbus.client.SunSpecModbusClientDevice(),
+            unit=unit,
+            max_ages={},
+        )
+        client._in_flight = self._in_flight
+
+        return client
 
     def __getitem__(
         self, item: typing.Union[int, str]
@@ -76,15 +311,79 @@ class Client:
         [model] = self.sunspec_device.models[item]
         return model
 
-    async def scan(self) -> None:
+    async def scan(
+        self,
+        read_ahead: bool = False,
+        cache: typing.Optional[ssst.sunspec.scan_cache.ScanCache] = None,
+        concurrent_probes: bool = False,
+        probe_max_read_count: bool = False,
+    ) -> None:
         """Scan the device to identify the base address, if not already set, and
         collect the model list.  This also populates all the data.
+
+        When a cache is passed, the sentinel and common model are read first and, if
+        the identified device has a cached layout, the remaining models through the end
+        model ID are read in bulk.  The layout is applied only if each model's ID and
+        length and the end model ID match it.  Otherwise the full scan proceeds and the
+        resulting layout is recorded in the cache.
+
+        When searching for the base address with concurrent probes, all the candidate
+        addresses are read at once and the first to respond with the sentinel is used.
+        Modbus exception responses are then treated as a mismatch rather than raised.
+
+        Each model's ID and length are read together and the model data is taken from
+        bulk reads.  When reading ahead, every request is extended to the full
+        :attr:`Client.max_read_count` so the following model headers are usually
+        already in hand.  Once the device rejects such a speculative read, usually for
+        running past its end, reading ahead stops and only the registers actually
+        needed are requested.  Reading ahead is only suitable for devices that answer
+        reads past their end with an exception response rather than not at all.
+
+        Arguments:
+            read_ahead: Whether to speculatively read beyond the registers immediately
+                needed.
+            cache: The layouts of previously scanned devices.
+            concurrent_probes: Whether to probe the candidate base addresses
+                concurrently rather than one after another.
+            probe_max_read_count: Whether to find the device's limit on the registers
+                read per request as soon as the base address is known.  See
+                :meth:`Client.probe_max_read_count`.
         """
-        if self.sunspec_device.base_addr is None:
+        if probe_max_read_count and self.sunspec_device.base_addr is not None:
+            await self.probe_max_read_count()
+            probe_max_read_count = False
+
+        if cache is not None:
+            scanned = await self._scan_cached(
+                cache=cache, probe_max_read_count=probe_max_read_count
+            )
+            if self.sunspec_device.base_addr is not None:
+                # The base address was confirmed and probed from while trying the cache.
+                probe_max_read_count = False
+            if scanned:
+                return
+
+        sentinel_length = len(ssst.sunspec.base_address_sentinel) // 2
+
+        if self.sunspec_device.base_addr is None and concurrent_probes:
+            base_address = await self._probe_base_addresses()
+            if base_address is None:
+                raise ssst.BaseAddressNotFoundError(
+                    addresses=self.sunspec_device.base_addr_list
+                )
+
+            self.sunspec_device.base_addr = base_address
+            reader = _ScanReader(
+                client=self,
+                address=self.sunspec_device.base_addr,
+                read_ahead=read_ahead,
+                data=bytearray(ssst.sunspec.base_address_sentinel),
+            )
+        elif self.sunspec_device.base_addr is None:
             for maybe_base_address in self.sunspec_device.base_addr_list:
                 read_bytes = await self.read_registers(
                     address=maybe_base_address,
-                    count=len(ssst.sunspec.base_address_sentinel) // 2,
+                    count=sentinel_length,
                 )
                 if read_bytes == ssst.sunspec.base_address_sentinel:
                     self.sunspec_device.base_addr = maybe_base_address
@@ -93,10 +392,22 @@ class Client:
                 raise ssst.BaseAddressNotFoundError(
                     addresses=self.sunspec_device.base_addr_list
                 )
+
+            reader = _ScanReader(
+                client=self,
+                address=self.sunspec_device.base_addr,
+                read_ahead=read_ahead,
+                data=bytearray(read_bytes),
+            )
         else:
-            read_bytes = await self.read_registers(
+            reader = _ScanReader(
+                client=self,
+                address=self.sunspec_device.base_addr,
+                read_ahead=read_ahead,
+            )
+            read_bytes = await reader.read(
                 address=self.sunspec_device.base_addr,
-                count=len(ssst.sunspec.base_address_sentinel) // 2,
+                count=sentinel_length,
             )
             if read_bytes != ssst.sunspec.base_address_sentinel:
                 raise ssst.InvalidBaseAddressError(
@@ -104,59 +415,427 @@ class Client:
                     value=read_bytes,
                 )
 
-        address = (
-            self.sunspec_device.base_addr + len(ssst.sunspec.base_address_sentinel) // 2
-        )
-        model_id_length = 1
-        model_length_length = 1
+        if probe_max_read_count:
+            await self.probe_max_read_count()
+
+        address = self.sunspec_device.base_addr + sentinel_length
+        header_length = 2
 
         while True:
-            model_address = address
-            intra_model_address = address
-            read_bytes = await self.read_registers(
-                address=address, count=model_id_length
-            )
-            intra_model_address += model_id_length
-            maybe_model_id = int.from_bytes(
-                bytes=read_bytes, byteorder="big", signed=False
+            try:
+                read_bytes = await reader.read(address=address, count=header_length)
+            except ssst.ModbusError:
+                # Some devices do not provide a length after the end model ID.
+                read_bytes = await reader.read(address=address, count=1)
+
+            model_id = int.from_bytes(
+                bytes=read_bytes[:2], byteorder="big", signed=False
             )
-            if maybe_model_id == sunspec2.mb.SUNS_END_MODEL_ID:
+            if model_id == sunspec2.mb.SUNS_END_MODEL_ID:
                 break
 
-            model_id = maybe_model_id
-
-            read_bytes = await self.read_registers(
-                address=intra_model_address, count=model_length_length
-            )
-            intra_model_address += model_length_length
             model_length = int.from_bytes(
-                bytes=read_bytes, byteorder="big", signed=False
+                bytes=read_bytes[2:4], byteorder="big", signed=False
             )
-
-            # TODO: oof, awkward way to write this it seems
-            whole_model_length = (intra_model_address - address) + model_length
-            model_data = self.read_registers(address=address, count=whole_model_length)
-            address += whole_model_length
+            whole_model_length = header_length + model_length
+            model_data = await reader.read(address=address, count=whole_model_length)
 
             model = sunspec2.modbus.client.SunSpecModbusClientModel(
                 model_id=model_id,
-                model_addr=model_address,
+                model_addr=address,
                 model_len=model_length,
                 data=model_data,
                 mb_device=self.sunspec_device,
             )
-            self.sunspec_device.add_model(model)
+            self._add_model(model)
+            self._update_scale_factors(model=model)
+
+            address += whole_model_length
+
+        if cache is not None and 1 in self.sunspec_device.models:
+            identity = ssst.sunspec.scan_cache.DeviceIdentity.from_model(model=self[1])
+            cache.layouts[identity] = ssst.sunspec.scan_cache.DeviceLayout(
+                base_address=self.sunspec_device.base_addr,
+                models=tuple(
+                    ssst.sunspec.scan_cache.ModelLayout(
+                        id=model.model_id,
+                        address=model.model_addr,
+                        length=model.model_len,
+                    )
+                    for model in self.sunspec_device.model_list
+                ),
+            )
+
+    async def probe_max_read_count(self) -> int:
+        """Find the largest number of registers the device allows in a single read and
+        store it as :attr:`Client.max_read_count`.  Reads from the base address are
+        made, starting at the Modbus limit, with each Modbus exception response taken
+        as the count being too large.  The count is bisected between the largest
+        accepted and smallest rejected counts.  A device smaller than the limit may
+        reject reads beyond its last register, but then no read of its registers
+        needs a larger count anyway.  The base address must be known.
+
+        Returns:
+            The number of registers.
+
+        Raises:
+            ssst.ModbusError: When even a single register read is rejected.
+        """
+        base_address = self.sunspec_device.base_addr
+        accepted = 0
+        rejected = max_read_registers + 1
+        count = max_read_registers
+        last_error: typing.Optional[ssst.ModbusError] = None
+
+        while rejected - accepted > 1:
+            try:
+                await self.read_registers(address=base_address, count=count)
+            except ssst.ModbusError as error:
+                last_error = error
+                rejected = count
+            else:
+                accepted = count
+
+            count = accepted + (rejected - accepted) // 2
+
+        if accepted == 0:
+            assert last_error is not None
+            raise last_error
+
+        self.max_read_count = accepted
+
+        return accepted
+
+    async def _probe_base_addresses(self) -> typing.Optional[int]:
+        """Concurrently read each of the candidate base addresses and return the first
+        found to hold the SunSpec sentinel.  The remaining probes are cancelled.
+
+        Returns:
+            The base address, or :obj:`None` if no candidate matched.
+        """
+        found: typing.List[int] = []
+
+        async def probe(address: int, nursery: trio.Nursery) -> None:
+            try:
+                read_bytes = await self.read_registers(
+                    address=address,
+                    count=len(ssst.sunspec.base_address_sentinel) // 2,
+                )
+            except ssst.ModbusError:
+                return
 
-    # TODO: should the local data be updated?
-    async def read_registers(self, address: int, count: int) -> bytes:
+            if read_bytes == ssst.sunspec.base_address_sentinel:
+                found.append(address)
+                nursery.cancel_scope.cancel()
+
+        async with trio.open_nursery() as nursery:
+            for address in self.sunspec_device.base_addr_list:
+                nursery.start_soon(probe, address, nursery)
+
+        if len(found) == 0:
+            return None
+
+        return found[0]
+
+    async def _scan_cached(
+        self,
+        cache: ssst.sunspec.scan_cache.ScanCache,
+        probe_max_read_count: bool = False,
+    ) -> bool:
+        """Try to identify the device and apply its layout from the passed cache.  The
+        local models are only populated if every model header in the bulk read matches
+        a cached layout.  Modbus exception responses are treated as a mismatch.
+
+        Arguments:
+            cache: The layouts of previously scanned devices.
+            probe_max_read_count: Whether to find the device's limit on the registers
+                read per request, when the base address is not yet known, as soon as a
+                cached base address is found to hold the sentinel.  The base address is
+                then set whether or not the layout is applied.
+
+        Returns:
+            Whether a cached layout was verified and applied.
+        """
+        sentinel_length = len(ssst.sunspec.base_address_sentinel) // 2
+        end_model_bytes = sunspec2.mb.SUNS_END_MODEL_ID.to_bytes(
+            length=2, byteorder="big", signed=False
+        )
+
+        if self.sunspec_device.base_addr is None:
+            base_addresses = cache.base_addresses()
+        else:
+            base_addresses = [self.sunspec_device.base_addr]
+
+        if probe_max_read_count and self.sunspec_device.base_addr is None:
+            for base_address in base_addresses:
+                try:
+                    read_bytes = await self.read_registers(
+                        address=base_address, count=sentinel_length
+                    )
+                except ssst.ModbusError:
+                    continue
+
+                if read_bytes == ssst.sunspec.base_address_sentinel:
+                    # The bulk reads below may be too large for the device.
+                    self.sunspec_device.base_addr = base_address
+                    await self.probe_max_read_count()
+                    base_addresses = [base_address]
+                    break
+            else:
+                return False
+
+        for base_address in base_addresses:
+            common_lengths = {
+                layout.models[0].length
+                for layout in cache.layouts.values()
+                if layout.base_address == base_address
+                and len(layout.models) > 0
+                and layout.models[0].id == 1
+            }
+
+            for common_length in sorted(common_lengths):
+                common_address = base_address + sentinel_length
+                try:
+                    read_bytes = await self.read_chunked_registers(
+                        address=base_address,
+                        count=sentinel_length + 2 + common_length,
+                    )
+                except ssst.ModbusError:
+                    continue
+
+                expected_prefix = ssst.sunspec.base_address_sentinel + b"".join(
+                    value.to_bytes(length=2, byteorder="big", signed=False)
+                    for value in [1, common_length]
+                )
+                if not read_bytes.startswith(expected_prefix):
+                    continue
+
+                common_model = sunspec2.modbus.client.SunSpecModbusClientModel(
+                    model_id=1,
+                    model_addr=common_address,
+                    model_len=common_length,
+                    data=read_bytes[2 * sentinel_length :],
+                    mb_device=self.sunspec_device,
+                )
+                identity = ssst.sunspec.scan_cache.DeviceIdentity.from_model(
+                    model=common_model
+                )
+                layout = cache.layouts.get(identity)
+                if (
+                    layout is None
+                    or layout.base_address != base_address
+                    or layout.models[0].length != common_length
+                ):
+                    continue
+
+                models_address = common_address + 2 + common_length
+                try:
+                    read_bytes = await self.read_chunked_registers(
+                        address=models_address,
+                        count=layout.end_address + 1 - models_address,
+                    )
+                except ssst.ModbusError:
+                    continue
+
+                if not read_bytes.endswith(end_model_bytes):
+                    continue
+
+                other_models = []
+                model_address = models_address
+                for model_layout in layout.models[1:]:
+                    offset = 2 * (model_address - models_address)
+                    header = b"".join(
+                        value.to_bytes(length=2, byteorder="big", signed=False)
+                        for value in [model_layout.id, model_layout.length]
+                    )
+                    if (
+                        model_layout.address != model_address
+                        or read_bytes[offset : offset + 4] != header
+                    ):
+                        break
+
+                    other_models.append(
+                        sunspec2.modbus.client.SunSpecModbusClientModel(
+                            model_id=model_layout.id,
+                            model_addr=model_layout.address,
+                            model_len=model_layout.length,
+                            data=read_bytes[
+                                offset : offset + 2 * (2 + model_layout.length)
+                            ],
+                            mb_device=self.sunspec_device,
+                        )
+                    )
+                    model_address += 2 + model_layout.length
+                else:
+                    self.sunspec_device.base_addr = base_address
+                    for model in [common_model, *other_models]:
+                        self._add_model(model)
+                        self._update_scale_factors(model=model)
+
+                    return True
+
+        return False
+
+    async def read_model(
+        self, model: sunspec2.modbus.client.SunSpecModbusClientModel
+    ) -> None:
+        """Read the entire passed model, including the ID and length header, from the
+        device and update the local data.  The read is split into as few requests as
+        the Modbus register limit allows.
+
+        Arguments:
+            model: The SunSpec model object to read.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        await self.read_models(models=[model])
+
+    async def read_models(
+        self,
+        models: typing.Optional[
+            typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientModel]
+        ] = None,
+    ) -> None:
+        """Read the passed models from the device and update the local data.  Models
+        that are adjacent in the register space are read together so a full refresh
+        takes only as many requests as the Modbus register limit requires.
+
+        Arguments:
+            models: The SunSpec model objects to read.  :obj:`None` reads all scanned
+                models.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        if models is None:
+            models = self.sunspec_device.model_list
+
+        spans: typing.List[
+            typing.List[sunspec2.modbus.client.SunSpecModbusClientModel]
+        ] = []
+        for model in sorted(models, key=lambda model: model.model_addr):
+            if len(spans) > 0:
+                last_model = spans[-1][-1]
+                if last_model.model_addr + 2 + last_model.model_len == model.model_addr:
+                    spans[-1].append(model)
+                    continue
+
+            spans.append([model])
+
+        for span in spans:
+            span_address = span[0].model_addr
+            span_end = span[-1].model_addr + 2 + span[-1].model_len
+            read_bytes = await self.read_chunked_registers(
+                address=span_address, count=span_end - span_address
+            )
+
+            for model in span:
+                start = 2 * (model.model_addr - span_address)
+                model.set_mb(
+                    data=read_bytes[start : start + 2 * (2 + model.model_len)],
+                    dirty=False,
+                )
+                self._update_scale_factors(model=model)
+
+    async def read_chunked_registers(
+        self, address: int, count: int, update: bool = False
+    ) -> bytes:
+        """Read from the specified sequential register range in the device, splitting
+        it into as many requests as needed to stay within the Modbus register limit.
+
+        Arguments:
+            address: The first register to read.
+            count: The total number of sequential registers to read.
+            update: Whether to update the local data of the points entirely within the
+                range.  See :meth:`Client.read_registers`.
+
+        Returns:
+            The raw bytes read from the device.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        ranges = [
+            RegisterRange(
+                address=chunk_address,
+                count=min(self.max_read_count, address + count - chunk_address),
+            )
+            for chunk_address in range(address, address + count, self.max_read_count)
+        ]
+
+        read_bytes = b"".join(await self._read_ranges(ranges=ranges))
+
+        if update:
+            self._update_local_data(address=address, data=read_bytes)
+
+        return read_bytes
+
+    async def _read_ranges(
+        self, ranges: typing.Sequence["RegisterRange"]
+    ) -> typing.List[bytes]:
+        """Read each of the passed register ranges.  The requests are sent
+        concurrently within the :attr:`Client.pipeline_window`, if set.
+
+        Arguments:
+            ranges: The register ranges to read.
+
+        Returns:
+            The raw bytes read for each range, in the order of the passed ranges.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.  If
+                several are received, only the first is raised.
+        """
+        if self._in_flight is None or len(ranges) < 2:
+            return [
+                await self.read_registers(
+                    address=register_range.address, count=register_range.count
+                )
+                for register_range in ranges
+            ]
+
+        results = [b""] * len(ranges)
+        errors: typing.List[ssst.ModbusError] = []
+
+        async def read(index: int, nursery: trio.Nursery) -> None:
+            register_range = ranges[index]
+            try:
+                results[index] = await self.read_registers(
+                    address=register_range.address, count=register_range.count
+                )
+            except ssst.ModbusError as error:
+                errors.append(error)
+                nursery.cancel_scope.cancel()
+
+        async with trio.open_nursery() as nursery:
+            for index in range(len(ranges)):
+                nursery.start_soon(read, index, nursery)
+
+        if len(errors) > 0:
+            raise errors[0]
+
+        return results
+
+    async def read_registers(
+        self, address: int, count: int, update: bool = False
+    ) -> bytes:
         """Read from the specified sequential register range in the device.  Based on
         the 16-bit Modbus register size, the data in the returned bytes is in 2-byte
-        chunks with each having a big-endian byte order.  The local data is not
-        updated.
+        chunks with each having a big-endian byte order.  If a read of a range that
+        contains the requested range is already in flight, such as one made by another
+        task, its response is shared instead of sending another request.  If that read
+        receives an exception response, the requested range is read on its own unless
+        the two ranges are the same.  Reads sent before an overlapping write by
+        :meth:`Client.write_registers` are not shared.
 
         Arguments:
             address: The first register to read.
             count: The total number of sequential registers to read.
+            update: Whether to update the local data of the scanned points entirely
+                within the range, as if they had been read by
+                :meth:`Client.read_points`.  Points only partially within the range
+                are left unchanged.
 
         Returns:
             The raw bytes read from the device.
@@ -164,23 +843,130 @@ class Client:
         Raises:
             ssst.ModbusError: When a Modbus exception response is received.
         """
+        requested_range = RegisterRange(address=address, count=count)
 
-        response = await self.protocol.read_holding_registers(
-            address=address, count=count, unit=0x01
-        )
+        while True:
+            for in_flight_read in self._in_flight_reads:
+                if in_flight_read.register_range.contains(other=requested_range):
+                    break
+            else:
+                read_bytes = await self._read_registers_in_flight(
+                    register_range=requested_range
+                )
+                break
 
-        if isinstance(response, pymodbus.pdu.ExceptionResponse):
-            raise ssst.ModbusError(exception=response)
+            await in_flight_read.done.wait()
+
+            if in_flight_read.data is not None:
+                start = 2 * (address - in_flight_read.register_range.address)
+                read_bytes = in_flight_read.data[start : start + 2 * count]
+                break
+
+            if in_flight_read.exception_response is not None:
+                if in_flight_read.register_range == requested_range:
+                    raise ssst.ModbusError(exception=in_flight_read.exception_response)
+
+                # A larger read may be rejected for reasons that do not apply to the
+                # requested range, such as running past the end of the device.
+                read_bytes = await self._read_registers_in_flight(
+                    register_range=requested_range
+                )
+                break
+
+            # The read failed without a response so make another attempt.
+
+        if update:
+            self._update_local_data(address=address, data=read_bytes)
+
+        return read_bytes
+
+    async def _read_registers_in_flight(self, register_range: "RegisterRange") -> bytes:
+        """Read the passed range while tracking it as in flight so that contained
+        reads may share the response.
+
+        Arguments:
+            register_range: The range to read.
 
-        return bytes(response.registers)
+        Returns:
+            The raw bytes read from the device.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        in_flight_read = _InFlightRead(register_range=register_range)
+        self._in_flight_reads.append(in_flight_read)
+
+        try:
+            response = await self._request(
+                self.protocol.read_holding_registers,
+                request_metrics=self.metrics.reads,
+                registers=register_range.count,
+                address=register_range.address,
+                count=register_range.count,
+                unit=self.unit,
+            )
+
+            if isinstance(response, pymodbus.pdu.ExceptionResponse):
+                in_flight_read.exception_response = response
+                raise ssst.ModbusError(exception=response)
+
+            in_flight_read.data = bytes(response.registers)
+        finally:
+            if in_flight_read in self._in_flight_reads:
+                self._in_flight_reads.remove(in_flight_read)
+            in_flight_read.done.set()
+
+        return in_flight_read.data
+
+    def _update_local_data(self, address: int, data: bytes) -> None:
+        """Decode the raw data read from the passed address into the local data of
+        the points entirely within it.  The scale factors of the points that depend
+        on any scale factor points updated are updated as well.
+
+        Arguments:
+            address: The address the data was read from.
+            data: The raw data.
+        """
+        if self._point_address_index is None:
+            self._point_address_index = ssst.sunspec.PointAddressIndex.build(
+                models=self.sunspec_device.model_list
+            )
+
+        end = address + len(data) // 2
+        now = trio.current_time()
+
+        for point in self._point_address_index.overlapping(
+            address=address, count=end - address
+        ):
+            point_address = self.point_address(point=point)
+            if point_address < address or point_address + point.len > end:
+                continue
+
+            start = 2 * (point_address - address)
+            point.set_mb(data=data[start : start + 2 * point.len], dirty=False)
+            self._point_read_times[point] = now
+
+            if point.pdef["type"] == "sunssf":
+                self._scale_factor_read_times[point] = now
+                index = self.scale_factor_index(model=point.model)
+                self._apply_scale_factor(
+                    scale_factor_point=point, points=index[point.pdef["name"]]
+                )
 
     async def read_point(
-        self, point: sunspec2.modbus.client.SunSpecModbusClientPoint
-    ) -> typing.Union[float, int]:
-        """Read the passed point from the device and update the local data.
+        self,
+        point: sunspec2.modbus.client.SunSpecModbusClientPoint,
+        max_age: typing.Optional[float] = None,
+    ) -> Value:
+        """Read the passed point from the device and update the local data, unless
+        the local value was read recently enough to be used instead.  Locally changed
+        points are always read.
 
         Arguments:
             point: The SunSpec point object to read.
+            max_age: The age in seconds up to which the local value is used.
+                :obj:`None` uses the default from :attr:`Client.max_ages` or
+                :data:`static_point_names`.
 
         Returns:
             The new computed value of the point.
@@ -188,25 +974,359 @@ class Client:
         Raises:
             ssst.ModbusError: When a Modbus exception response is received.
         """
+        if max_age is None:
+            max_age = self._max_age(point=point)
+
+        if max_age > 0 and not point.dirty:
+            read_times = [
+                read_time
+                for read_time in [
+                    self._point_read_times.get(point),
+                    self._model_read_times.get(point.model),
+                ]
+                if read_time is not None
+            ]
+            # A point that was never read is not fresh, even for an infinite age.
+            if len(read_times) > 0 and trio.current_time() - max(read_times) <= max_age:
+                return point.cvalue  # type: ignore[no-any-return]
+
         if point.sf is not None:
-            await self.read_point(point=point.model.points[point.sf])
+            await self._refresh_scale_factor(
+                scale_factor_point=point.model.points[point.sf]
+            )
 
         read_bytes = await self.read_registers(
             address=self.point_address(point=point),
             count=point.len,
         )
-        point.set_mb(data=read_bytes)
+        point.set_mb(data=read_bytes, dirty=False)
+        now = trio.current_time()
+        self._point_read_times[point] = now
 
         if point.pdef["type"] == "sunssf":
-            for other_point in point.model.points.values():
-                if other_point.sf == point.pdef["name"]:
-                    other_cvalue = other_point.cvalue
-                    other_point.sf_value = point.cvalue
-                    if other_cvalue is not None:
-                        other_point.cvalue = other_cvalue
+            self._scale_factor_read_times[point] = now
+            index = self.scale_factor_index(model=point.model)
+            self._apply_scale_factor(
+                scale_factor_point=point, points=index[point.pdef["name"]]
+            )
 
         return point.cvalue  # type: ignore[no-any-return]
 
+    def _max_age(self, point: sunspec2.modbus.client.SunSpecModbusClientPoint) -> float:
+        """Look up the default age up to which the local value of the passed point is
+        used by :meth:`Client.read_point`.
+
+        Arguments:
+            point: The SunSpec point object.
+
+        Returns:
+            The age in seconds.
+        """
+        max_age = self.max_ages.get(point)
+        if max_age is not None:
+            return max_age
+
+        max_age = self.max_ages.get(point.model)
+        if max_age is not None:
+            return max_age
+
+        static_names = static_point_names.get(point.model.model_id, frozenset())
+        if point.pdef["name"] in static_names:
+            return math.inf
+
+        return 0
+
+    async def read_points(
+        self,
+        points: typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientPoint],
+        max_gap: int = 0,
+    ) -> typing.List[Value]:
+        """Read the passed points from the device and update the local data.  The
+        points, along with their scale factor points, are sorted by address and
+        merged into as few requests as possible.  Ranges separated by no more than
+        ``max_gap`` registers are read together along with the registers between them.
+        See :meth:`Client.build_read_plan` to avoid repeating this planning when the
+        same points are read repeatedly.
+
+        Arguments:
+            points: The SunSpec point objects to read.
+            max_gap: The largest number of unrequested registers to read in order to
+                merge two ranges into a single request.
+
+        Returns:
+            The new computed values of the points, in the order they were passed.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        plan = self.build_read_plan(points=points, max_gap=max_gap)
+        return await self.execute_read_plan(plan=plan)
+
+    def compile_read_plan(
+        self,
+        names: typing.Iterable[typing.Tuple[typing.Union[int, str], str]],
+        max_gap: int = 0,
+    ) -> "ReadPlan":
+        """Compile a read plan for the points identified by the passed model and point
+        names.  The scan must already have been completed.
+
+        .. code-block:: python
+
+            plan = client.compile_read_plan(names=[(103, "W"), ("common", "SN")])
+
+            while True:
+                watts, serial_number = await client.execute_read_plan(plan=plan)
+
+        Arguments:
+            names: The ``(model, point_name)`` pairs identifying the points to read.
+                The model is identified by number or name as with
+                :meth:`Client.__getitem__`.
+            max_gap: See :meth:`Client.read_points`.
+
+        Returns:
+            The compiled read plan.
+        """
+        return self.build_read_plan(
+            points=[self[model].points[name] for model, name in names],
+            max_gap=max_gap,
+        )
+
+    def build_read_plan(
+        self,
+        points: typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientPoint],
+        max_gap: int = 0,
+    ) -> "ReadPlan":
+        """Build a read plan for the passed points.  All address calculation, request
+        merging, and scale factor lookup is done here so that repeated executions of
+        the plan need only send the requests and decode the results.  A plan remains
+        valid until the device is scanned again.
+
+        Arguments:
+            points: The SunSpec point objects to read.
+            max_gap: See :meth:`Client.read_points`.
+
+        Returns:
+            The read plan.
+        """
+        all_points: typing.Dict[
+            sunspec2.modbus.client.SunSpecModbusClientPoint, None
+        ] = {}
+        scale_factor_points: typing.Dict[
+            sunspec2.modbus.client.SunSpecModbusClientPoint, None
+        ] = {}
+        for point in points:
+            if point.sf is not None:
+                scale_factor_point = point.model.points[point.sf]
+                all_points[scale_factor_point] = None
+                scale_factor_points[scale_factor_point] = None
+            all_points[point] = None
+
+        scale_factors = [
+            (
+                scale_factor_point,
+                tuple(
+                    self.scale_factor_index(model=scale_factor_point.model)[
+                        scale_factor_point.pdef["name"]
+                    ]
+                ),
+            )
+            for scale_factor_point in scale_factor_points
+        ]
+
+        sorted_points = sorted(all_points, key=self.point_address)
+        ranges = plan_register_ranges(
+            spans=[(self.point_address(point), point.len) for point in sorted_points],
+            max_gap=max_gap,
+            max_count=self.max_read_count,
+        )
+
+        plan_ranges = []
+        points_iterator = iter(sorted_points)
+        point = next(points_iterator, None)
+        for register_range in ranges:
+            decoders = []
+            while point is not None and self.point_address(point) < register_range.end:
+                start = 2 * (self.point_address(point) - register_range.address)
+                decoders.append((point, slice(start, start + 2 * point.len)))
+                point = next(points_iterator, None)
+
+            plan_ranges.append(
+                ReadPlanRange(register_range=register_range, decoders=tuple(decoders))
+            )
+
+        return ReadPlan(
+            ranges=tuple(plan_ranges),
+            scale_factors=tuple(scale_factors),
+            points=tuple(points),
+        )
+
+    async def execute_read_plan(self, plan: "ReadPlan") -> typing.List[Value]:
+        """Read the points in the passed plan from the device and update the local
+        data.
+
+        Arguments:
+            plan: The plan to execute as built by :meth:`Client.build_read_plan` or
+                :meth:`Client.compile_read_plan`.
+
+        Returns:
+            The new computed values of the points, in the order they were passed when
+            building the plan.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        all_read_bytes = await self._read_ranges(
+            ranges=[plan_range.register_range for plan_range in plan.ranges]
+        )
+
+        now = trio.current_time()
+        for plan_range, read_bytes in zip(plan.ranges, all_read_bytes):
+            for point, data_slice in plan_range.decoders:
+                point.set_mb(data=read_bytes[data_slice], dirty=False)
+                self._point_read_times[point] = now
+
+        for scale_factor_point, dependent_points in plan.scale_factors:
+            self._scale_factor_read_times[scale_factor_point] = now
+            self._apply_scale_factor(
+                scale_factor_point=scale_factor_point, points=dependent_points
+            )
+
+        return [point.cvalue for point in plan.points]
+
+    def _apply_scale_factor(
+        self,
+        scale_factor_point: sunspec2.modbus.client.SunSpecModbusClientPoint,
+        points: typing.Iterable[sunspec2.modbus.client.SunSpecModbusClientPoint],
+    ) -> None:
+        """Update the cached scale factor values of the passed points from the local
+        value of the passed scale factor point.  Points that have been changed locally
+        keep their computed values and remain changed, so that a later write sends the
+        values as intended with the new scale factor.
+
+        Arguments:
+            scale_factor_point: The SunSpec scale factor point object.
+            points: The SunSpec point objects that depend on the scale factor.
+        """
+        scale_factor = scale_factor_point.cvalue
+
+        for point in points:
+            if not point.dirty or scale_factor is None:
+                point.sf_value = scale_factor
+                continue
+
+            cvalue = point.cvalue
+            point.sf_value = scale_factor
+            if cvalue is not None:
+                # Assigning the computed value would store a float unscaled when the
+                # scale factor is zero.
+                point.value = int(round(cvalue * 10 ** -scale_factor))
+                point.dirty = True
+
+    def _update_scale_factors(
+        self, model: sunspec2.modbus.client.SunSpecModbusClientModel
+    ) -> None:
+        """Update the cached scale factor values of all the points in the passed model
+        from the local data of their scale factor points and record when the model
+        was read.  This is needed after the raw data of a model has been updated in
+        bulk.
+
+        Arguments:
+            model: The SunSpec model object to update.
+        """
+        now = trio.current_time()
+        self._model_read_times[model] = now
+
+        for name, points in self.scale_factor_index(model=model).items():
+            scale_factor_point = model.points[name]
+            self._scale_factor_read_times[scale_factor_point] = now
+            scale_factor = scale_factor_point.cvalue
+            for point in points:
+                point.sf_value = scale_factor
+
+        self._scale_factor_read_models.add(model)
+
+    def scale_factor_index(
+        self, model: sunspec2.modbus.client.SunSpecModbusClientModel
+    ) -> ssst.sunspec.ScaleFactorIndex:
+        """Get the scale factor dependency index for the passed model.  Indexes are
+        built when models are scanned, or on first use for any other model.
+
+        Arguments:
+            model: The SunSpec model object.
+
+        Returns:
+            The index of points by the name of their scale factor point.
+        """
+        index = self._scale_factor_indexes.get(model)
+        if index is None:
+            index = ssst.sunspec.build_scale_factor_index(model=model)
+            self._scale_factor_indexes[model] = index
+
+        return index
+
+    def _add_model(
+        self, model: sunspec2.modbus.client.SunSpecModbusClientModel
+    ) -> None:
+        """Add the passed model to the SunSpec device and index its scale factors.
+
+        Arguments:
+            model: The SunSpec model object to add.
+        """
+        self.sunspec_device.add_model(model)
+        self._point_address_index = None
+        self._scale_factor_indexes[model] = ssst.sunspec.build_scale_factor_index(
+            model=model
+        )
+
+    async def _refresh_scale_factor(
+        self, scale_factor_point: sunspec2.modbus.client.SunSpecModbusClientPoint
+    ) -> None:
+        """Read the passed scale factor point unless the local value is acceptable per
+        :attr:`Client.scale_factor_policy`.
+
+        Arguments:
+            scale_factor_point: The SunSpec scale factor point object.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        if self.scale_factor_policy == ScaleFactorPolicy.Forever:
+            fresh = scale_factor_point in self._scale_factor_read_times
+        elif self.scale_factor_policy == ScaleFactorPolicy.TimeToLive:
+            read_time = self._scale_factor_read_times.get(scale_factor_point)
+            fresh = (
+                read_time is not None
+                and trio.current_time() - read_time < self.scale_factor_time_to_live
+            )
+        elif self.scale_factor_policy == ScaleFactorPolicy.ModelRead:
+            fresh = scale_factor_point.model in self._scale_factor_read_models
+        else:
+            fresh = False
+
+        if not fresh:
+            await self.read_point(point=scale_factor_point)
+
+    def invalidate_scale_factors(
+        self,
+        model: typing.Optional[sunspec2.modbus.client.SunSpecModbusClientModel] = None,
+    ) -> None:
+        """Forget when scale factors were read so that the next point read or write
+        that uses them will read them again, whatever the policy.
+
+        Arguments:
+            model: The SunSpec model object whose scale factors are to be invalidated.
+                :obj:`None` invalidates all scale factors.
+        """
+        if model is None:
+            self._scale_factor_read_times.clear()
+            self._scale_factor_read_models.clear()
+            return
+
+        self._scale_factor_read_models.discard(model)
+        for point in list(self._scale_factor_read_times):
+            if point.model is model:
+                del self._scale_factor_read_times[point]
+
     def point_address(
         self, point: sunspec2.modbus.client.SunSpecModbusClientPoint
     ) -> int:
@@ -220,6 +1340,35 @@ class Client:
         """
         return point.model.model_addr + point.offset  # type: ignore[no-any-return]
 
+    async def _request(
+        self,
+        method: typing.Callable[..., typing.Awaitable[object]],
+        request_metrics: ssst.sunspec.metrics.RequestMetrics,
+        registers: int,
+        **kwargs: object,
+    ) -> typing.Any:
+        """Send a request through the passed protocol method, waiting for room in the
+        :attr:`Client.pipeline_window` if one is set.
+
+        Arguments:
+            method: The protocol method to call.
+            request_metrics: The metrics to record the request in.
+            registers: The number of registers the request transfers.
+            kwargs: The arguments for the protocol method.
+
+        Returns:
+            The response.
+        """
+        if self._in_flight is None:
+            return await request_metrics.measure(
+                request=method(**kwargs), registers=registers
+            )
+
+        async with self._in_flight:
+            return await request_metrics.measure(
+                request=method(**kwargs), registers=registers
+            )
+
     async def write_registers(self, address: int, values: bytes) -> None:
         """Write to the specified sequential register range in the device.  Based on
         the 16-bit Modbus register size, the data in the passed bytes should in 2-byte
@@ -236,8 +1385,22 @@ class Client:
         Raises:
             ssst.ModbusError: When a Modbus exception response is received.
         """
-        response = await self.protocol.write_registers(
-            address=address, values=values, unit=0x01
+        written_range = RegisterRange(address=address, count=len(values) // 2)
+        # Reads already sent may be answered with the data from before this write, so
+        # reads made after it must not share them.
+        self._in_flight_reads[:] = [
+            in_flight_read
+            for in_flight_read in self._in_flight_reads
+            if not in_flight_read.register_range.overlaps(other=written_range)
+        ]
+
+        response = await self._request(
+            self.protocol.write_registers,
+            request_metrics=self.metrics.writes,
+            registers=len(values) // 2,
+            address=address,
+            values=values,
+            unit=self.unit,
         )
 
         if isinstance(response, pymodbus.pdu.ExceptionResponse):
@@ -255,10 +1418,322 @@ class Client:
             ssst.ModbusError: When a Modbus exception response is received.
         """
         if point.sf is not None:
-            await self.read_point(point=point.model.points[point.sf])
+            await self._refresh_scale_factor(
+                scale_factor_point=point.model.points[point.sf]
+            )
 
         bytes_to_write = point.get_mb()
         await self.write_registers(
             address=self.point_address(point=point),
             values=bytes_to_write,
         )
+        point.dirty = False
+
+    async def write_points(
+        self, points: typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientPoint]
+    ) -> None:
+        """Write the passed points from the local data to the device.  Each scale
+        factor needed is read at most once, subject to the
+        :attr:`Client.scale_factor_policy`, and the points are sorted by address with
+        contiguous points merged into as few requests as the Modbus register limit
+        allows.  The requests are sent in address order.
+
+        Scale factors that are being written are not read.  Their local values are
+        used instead, and the points that depend on them are encoded with them while
+        keeping their computed values.  Scale factors that have been changed locally
+        but are not being written are handled like any other, as the device keeps its
+        own value for them.
+
+        Arguments:
+            points: The SunSpec point objects to write.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        unique_points = list(dict.fromkeys(points))
+
+        scale_factor_points = dict.fromkeys(
+            point.model.points[point.sf]
+            for point in unique_points
+            if point.sf is not None
+        )
+        local_scale_factor_points = {
+            scale_factor_point
+            for scale_factor_point in scale_factor_points
+            if scale_factor_point in unique_points
+        }
+        for scale_factor_point in scale_factor_points:
+            if scale_factor_point not in local_scale_factor_points:
+                await self._refresh_scale_factor(scale_factor_point=scale_factor_point)
+
+        for point in unique_points:
+            if point.sf is None:
+                continue
+
+            scale_factor_point = point.model.points[point.sf]
+            scale_factor = scale_factor_point.cvalue
+            if (
+                scale_factor_point in local_scale_factor_points
+                and scale_factor is not None
+                and point.sf_value != scale_factor
+            ):
+                cvalue = point.cvalue
+                point.sf_value = scale_factor
+                if cvalue is not None:
+                    # Assigning the computed value would store a float unscaled when
+                    # the scale factor is zero.
+                    point.value = int(round(cvalue * 10 ** -scale_factor))
+
+        sorted_points = sorted(unique_points, key=self.point_address)
+        ranges = plan_register_ranges(
+            spans=[(self.point_address(point), point.len) for point in sorted_points],
+            max_count=max_write_registers,
+        )
+
+        points_iterator = iter(sorted_points)
+        point = next(points_iterator, None)
+        for register_range in ranges:
+            bytes_to_write = bytearray()
+            while point is not None and self.point_address(point) < register_range.end:
+                bytes_to_write.extend(point.get_mb())
+                point = next(points_iterator, None)
+
+            await self.write_registers(
+                address=register_range.address, values=bytes(bytes_to_write)
+            )
+
+        for point in sorted_points:
+            point.dirty = False
+
+    def dirty_points(
+        self,
+        models: typing.Optional[
+            typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientModel]
+        ] = None,
+    ) -> typing.List[sunspec2.modbus.client.SunSpecModbusClientPoint]:
+        """Collect the points that have been changed in the local data since they
+        were last read from or written to the device.  Assigning to a point's
+        ``value`` or ``cvalue`` marks it as changed.
+
+        Arguments:
+            models: The SunSpec model objects to check.  :obj:`None` checks all
+                scanned models.
+
+        Returns:
+            The changed SunSpec point objects, in register order within each model.
+        """
+        if models is None:
+            models = self.sunspec_device.model_list
+
+        return [
+            point
+            for model in models
+            for point in ssst.sunspec.iterate_points(group=model)
+            if point.dirty
+        ]
+
+    async def flush(
+        self,
+        models: typing.Optional[
+            typing.Sequence[sunspec2.modbus.client.SunSpecModbusClientModel]
+        ] = None,
+    ) -> None:
+        """Write only the points that have been changed in the local data to the
+        device, merged into as few requests as possible as by
+        :meth:`Client.write_points`.  Nothing is sent when no points have changed.
+
+        Arguments:
+            models: The SunSpec model objects to flush.  :obj:`None` flushes all
+                scanned models.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        points = self.dirty_points(models=models)
+        if len(points) == 0:
+            return
+
+        await self.write_points(points=points)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RegisterRange:
+    """A sequential range of registers to be transferred in a single request."""
+
+    address: int
+    """The first register in the range."""
+    count: int
+    """The number of registers in the range."""
+
+    @property
+    def end(self) -> int:
+        """The exclusive end address.  This is the first address after the range."""
+        return self.address + self.count
+
+    def contains(self, other: "RegisterRange") -> bool:
+        """Check whether the passed range lies entirely within this range.
+
+        Arguments:
+            other: The range to check.
+
+        Returns:
+            Whether the passed range is contained.
+        """
+        return self.address <= other.address and other.end <= self.end
+
+    def overlaps(self, other: "RegisterRange") -> bool:
+        """Check whether the passed range shares any registers with this range.
+
+        Arguments:
+            other: The range to check.
+
+        Returns:
+            Whether the ranges overlap.
+        """
+        return self.address < other.end and other.address < self.end
+
+
+@attr.s(auto_attribs=True, eq=False)
+class _InFlightRead:
+    """A register read that has been sent and whose outcome other reads of contained
+    ranges may wait for.
+    """
+
+    register_range: RegisterRange
+    """The range being read."""
+    done: trio.Event = attr.ib(factory=trio.Event)
+    """Set once the read has completed, successfully or not."""
+    data: typing.Optional[bytes] = None
+    """The raw bytes read, if the read succeeded."""
+    exception_response: typing.Optional[pymodbus.pdu.ExceptionResponse] = None
+    """The exception response received, if any."""
+
+
+@attr.s(auto_attribs=True)
+class _ScanReader:
+    """Buffers the sequential register reads made while scanning so that registers
+    read ahead can be used to satisfy later reads without another request.
+    """
+
+    client: Client
+    """The client to read with."""
+    address: int
+    """The address of the first buffered register."""
+    read_ahead: bool
+    """Whether to read beyond the requested registers up to the request size limit.
+    This is disabled once such a speculative read is rejected."""
+    data: bytearray = attr.ib(factory=bytearray)
+    """The buffered register data, starting at :attr:`_ScanReader.address`."""
+
+    async def read(self, address: int, count: int) -> bytes:
+        """Read the specified sequential register range, using the buffered data when
+        possible.  Reads must not start before the buffered data.
+
+        Arguments:
+            address: The first register to read.
+            count: The total number of sequential registers to read.
+
+        Returns:
+            The raw bytes read from the device.
+
+        Raises:
+            ssst.ModbusError: When a Modbus exception response is received.
+        """
+        end = address + count
+        buffered_end = self.address + len(self.data) // 2
+
+        while buffered_end < end:
+            if self.read_ahead:
+                read_count = self.client.max_read_count
+                try:
+                    read_bytes = await self.client.read_registers(
+                        address=buffered_end, count=read_count
+                    )
+                except ssst.ModbusError:
+                    # Likely read past the end of the device, so further speculative
+                    # reads would only be rejected as well.
+                    self.read_ahead = False
+                    continue
+            else:
+                read_count = end - buffered_end
+                read_bytes = await self.client.read_chunked_registers(
+                    address=buffered_end, count=read_count
+                )
+
+            self.data.extend(read_bytes)
+            buffered_end += read_count
+
+        start = 2 * (address - self.address)
+        return bytes(self.data[start : start + 2 * count])
+
+
+PointDecoder = typing.Tuple[sunspec2.modbus.client.SunSpecModbusClientPoint, slice]
+"""A point paired with the slice of the read bytes holding its data."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ReadPlanRange:
+    """A single request within a :class:`ReadPlan` along with the points to be decoded
+    from the response."""
+
+    register_range: RegisterRange
+    """The registers to be read."""
+    decoders: typing.Tuple[PointDecoder, ...]
+    """The points to be updated from the read bytes."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ReadPlan:
+    """An immutable, precompiled plan for reading a set of points.  Build these with
+    :meth:`Client.build_read_plan` or :meth:`Client.compile_read_plan` and execute
+    them with :meth:`Client.execute_read_plan`.
+    """
+
+    ranges: typing.Tuple[ReadPlanRange, ...]
+    """The requests to be made, sorted by address."""
+    scale_factors: typing.Tuple[
+        typing.Tuple[
+            sunspec2.modbus.client.SunSpecModbusClientPoint,
+            typing.Tuple[sunspec2.modbus.client.SunSpecModbusClientPoint, ...],
+        ],
+        ...,
+    ]
+    """The scale factor points to be read, each paired with all the points in its
+    model that depend on it and are to be updated after reading."""
+    points: typing.Tuple[sunspec2.modbus.client.SunSpecModbusClientPoint, ...]
+    """The requested points, in the order their values are to be reported."""
+
+
+def plan_register_ranges(
+    spans: typing.Iterable[typing.Tuple[int, int]],
+    max_gap: int = 0,
+    max_count: int = max_read_registers,
+) -> typing.List[RegisterRange]:
+    """Merge the passed register spans into as few ranges as possible.  Spans which
+    overlap, are adjacent, or are separated by no more than ``max_gap`` registers are
+    merged so long as the resulting range does not exceed ``max_count`` registers.
+
+    Arguments:
+        spans: The ``(address, count)`` pairs to be covered.
+        max_gap: The largest number of uncovered registers allowed between two spans
+            that are merged.
+        max_count: The largest number of registers allowed in a single range.
+
+    Returns:
+        The ranges covering all the spans, sorted by address.
+    """
+    ranges: typing.List[RegisterRange] = []
+
+    for address, count in sorted(spans):
+        end = address + count
+
+        if len(ranges) > 0:
+            last = ranges[-1]
+            merged_count = max(end, last.end) - last.address
+            if address <= last.end + max_gap and merged_count <= max_count:
+                ranges[-1] = RegisterRange(address=last.address, count=merged_count)
+                continue
+
+        ranges.append(RegisterRange(address=address, count=count))
+
+    return ranges
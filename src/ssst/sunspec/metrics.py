@@ -0,0 +1,201 @@
+import bisect
+import typing
+
+import attr
+import pymodbus.pdu
+import trio
+
+
+latency_bucket_bounds = (
+    0.0001,
+    0.0002,
+    0.0005,
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1,
+    2,
+    5,
+    10,
+)
+"""The inclusive upper bounds, in seconds, of the latency histogram buckets.  Latencies
+beyond the last bound are counted in a final overflow bucket."""
+
+
+@attr.s(auto_attribs=True)
+class LatencyHistogram:
+    """Counts request latencies in the fixed :data:`latency_bucket_bounds` buckets so
+    that recording is cheap and memory use is constant.
+    """
+
+    counts: typing.List[int] = attr.ib(
+        factory=lambda: [0] * (len(latency_bucket_bounds) + 1)
+    )
+    """The number of latencies recorded in each bucket, ending with the overflow
+    bucket."""
+    maximum: float = 0
+    """The largest latency recorded."""
+
+    def record(self, latency: float) -> None:
+        """Count the passed latency.
+
+        Arguments:
+            latency: The latency in seconds.
+        """
+        self.counts[bisect.bisect_left(latency_bucket_bounds, latency)] += 1
+        self.maximum = max(self.maximum, latency)
+
+    def quantile(self, fraction: float) -> typing.Optional[float]:
+        """Estimate the latency below which the passed fraction of the recorded
+        latencies fall.  The estimate is the upper bound of the bucket holding the
+        quantile, or the maximum for the overflow bucket, and is thus never lower than
+        the actual quantile.
+
+        Arguments:
+            fraction: The fraction, such as ``0.95`` for the 95th percentile.
+
+        Returns:
+            The latency in seconds, or :obj:`None` if nothing has been recorded.
+        """
+        total = sum(self.counts)
+        if total == 0:
+            return None
+
+        threshold = fraction * total
+        cumulative = 0
+        for bound, count in zip(latency_bucket_bounds, self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return min(bound, self.maximum)
+
+        return self.maximum
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RequestMetricsSnapshot:
+    """The totals for one kind of request at the time of the snapshot."""
+
+    requests: int
+    """The number of requests that received a response."""
+    registers: int
+    """The number of registers transferred by successful requests."""
+    bytes: int
+    """The number of register data bytes transferred by successful requests."""
+    errors: typing.Dict[int, int]
+    """The number of Modbus exception responses by exception code."""
+    p50: typing.Optional[float]
+    """The median latency in seconds.  See :meth:`LatencyHistogram.quantile`."""
+    p95: typing.Optional[float]
+    """The 95th percentile latency in seconds."""
+    p99: typing.Optional[float]
+    """The 99th percentile latency in seconds."""
+    maximum: typing.Optional[float]
+    """The largest latency in seconds."""
+
+
+@attr.s(auto_attribs=True)
+class RequestMetrics:
+    """The running totals for one kind of request."""
+
+    requests: int = 0
+    """The number of requests that received a response."""
+    registers: int = 0
+    """The number of registers transferred by successful requests."""
+    errors: typing.Dict[int, int] = attr.ib(factory=dict)
+    """The number of Modbus exception responses by exception code."""
+    latency: LatencyHistogram = attr.ib(factory=LatencyHistogram)
+    """The time from sending each request until receiving its response."""
+
+    async def measure(
+        self, request: typing.Awaitable[object], registers: int
+    ) -> typing.Any:
+        """Await the passed request and record its outcome.  Requests that end
+        without a response, such as when cancelled, are not recorded.
+
+        Arguments:
+            request: The request to send.
+            registers: The number of registers the request transfers if it succeeds.
+
+        Returns:
+            The response.
+        """
+        start = trio.current_time()
+        response = await request
+        self.latency.record(latency=trio.current_time() - start)
+        self.requests += 1
+
+        if isinstance(response, pymodbus.pdu.ExceptionResponse):
+            code = response.exception_code
+            self.errors[code] = self.errors.get(code, 0) + 1
+        else:
+            self.registers += registers
+
+        return response
+
+    def snapshot(self) -> RequestMetricsSnapshot:
+        """Capture the current totals.
+
+        Returns:
+            The snapshot.
+        """
+        return RequestMetricsSnapshot(
+            requests=self.requests,
+            registers=self.registers,
+            bytes=2 * self.registers,
+            errors=dict(self.errors),
+            p50=self.latency.quantile(fraction=0.5),
+            p95=self.latency.quantile(fraction=0.95),
+            p99=self.latency.quantile(fraction=0.99),
+            maximum=self.latency.maximum if self.requests > 0 else None,
+        )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ClientMetricsSnapshot:
+    """The request totals of a client at the time of the snapshot."""
+
+    reads: RequestMetricsSnapshot
+    """The totals for register reads."""
+    writes: RequestMetricsSnapshot
+    """The totals for register writes."""
+
+
+@attr.s(auto_attribs=True)
+class ClientMetrics:
+    """The request totals of a single client, and thus a single device.  Latencies are
+    measured once any :attr:`ssst.sunspec.client.Client.pipeline_window` has room for
+    the request so that they reflect the device and network rather than queueing in
+    the client.
+
+    .. code-block:: python
+
+        snapshot = client.metrics.snapshot()
+        print(snapshot.reads.requests, snapshot.reads.p95)
+    """
+
+    reads: RequestMetrics = attr.ib(factory=RequestMetrics)
+    """The totals for register reads."""
+    writes: RequestMetrics = attr.ib(factory=RequestMetrics)
+    """The totals for register writes."""
+
+    def snapshot(self) -> ClientMetricsSnapshot:
+        """Capture the current totals.
+
+        Returns:
+            The snapshot.
+        """
+        return ClientMetricsSnapshot(
+            reads=self.reads.snapshot(),
+            writes=self.writes.snapshot(),
+        )
+
+    def reset(self) -> None:
+        """Clear all totals."""
+        self.reads = RequestMetrics()
+        self.writes = RequestMetrics()
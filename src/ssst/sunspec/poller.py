@@ -0,0 +1,325 @@
+import math
+import typing
+
+import attr
+import sunspec2.modbus.client
+import trio
+import trio_typing
+
+import ssst
+import ssst.sunspec.client
+
+
+ticks_per_second = 1_000_000_000
+"""The resolution of poll scheduling.  Intervals are rounded to whole ticks so that
+the deadlines of groups with different intervals coincide exactly when due together.
+"""
+
+
+Value = ssst.sunspec.client.Value
+"""See :data:`ssst.sunspec.client.Value`."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Deadband:
+    """The amount a numeric value must change by before it is reported again.  The
+    change must exceed both the absolute deadband and the percentage of the previously
+    reported value.  Any change of a non-numeric value, or to or from :obj:`None`, is
+    reported.  The default deadband reports any change.
+    """
+
+    absolute: float = 0
+    """The absolute change in the computed value."""
+    percent: float = 0
+    """The change relative to the previously reported value, in percent."""
+
+    def exceeded(self, reported: Value, value: Value) -> bool:
+        """Check whether the passed value should be reported.
+
+        Arguments:
+            reported: The previously reported value.
+            value: The new value.
+
+        Returns:
+            Whether the change exceeds the deadband.
+        """
+        if not isinstance(reported, (int, float)) or not isinstance(
+            value, (int, float)
+        ):
+            return reported != value
+
+        threshold = max(self.absolute, abs(reported) * self.percent / 100)
+        return abs(value - reported) > threshold
+
+
+@attr.s(auto_attribs=True, frozen=True, eq=False)
+class PollGroup:
+    """A set of points to be read periodically.  Groups compare by identity so the
+    same points may be polled by several groups at different intervals.
+
+    With a deadband, each result holds only the points whose values changed beyond the
+    deadband since they were last reported, or whose heartbeat has expired, and polls
+    with nothing to report produce no result.  Every point is reported on the first
+    poll.
+    """
+
+    points: typing.Tuple[sunspec2.modbus.client.SunSpecModbusClientPoint, ...]
+    """The SunSpec point objects to read."""
+    interval: float
+    """The time in seconds between the starts of consecutive polls."""
+    deadband: typing.Optional[Deadband] = None
+    """The change required to report a value.  :obj:`None` reports every value on
+    every poll."""
+    heartbeat: typing.Optional[float] = None
+    """When using a deadband, the time in seconds after which an unchanged value is
+    reported again anyway.  :obj:`None` disables the heartbeat."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class PollResult:
+    """The values read for a single poll of a group."""
+
+    group: PollGroup
+    """The group that was polled."""
+    deadline: float
+    """The :func:`trio.current_time` at which the poll was scheduled."""
+    values: typing.Dict[sunspec2.modbus.client.SunSpecModbusClientPoint, Value]
+    """The new computed values of the group's points.  With a deadband, only the
+    points being reported are included."""
+    error: typing.Optional[ssst.ModbusError] = None
+    """The error that prevented the group's points from being read, in which case
+    there are no values."""
+
+
+@attr.s(auto_attribs=True, eq=False)
+class _Subscription:
+    """The scheduling state and result channel for a single group."""
+
+    group: PollGroup
+    send_channel: "trio.MemorySendChannel[PollResult]"
+    interval_ticks: int
+    """The group's interval in ticks of :data:`ticks_per_second`."""
+    cycle: int = 0
+    """The number of intervals after the start of polling of the next deadline."""
+    reported: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientPoint, typing.Tuple[Value, float]
+    ] = attr.ib(factory=dict)
+    """The last reported value of each point and the deadline it was reported at."""
+
+    def changes(
+        self,
+        values: typing.Dict[sunspec2.modbus.client.SunSpecModbusClientPoint, Value],
+        deadline: float,
+    ) -> typing.Dict[sunspec2.modbus.client.SunSpecModbusClientPoint, Value]:
+        """Select the values to be reported per the group's deadband and heartbeat,
+        and record them as reported.
+
+        Arguments:
+            values: The newly read values.
+            deadline: The deadline the values were read for.
+
+        Returns:
+            The values to report.
+        """
+        deadband = self.group.deadband
+        if deadband is None:
+            return values
+
+        heartbeat = self.group.heartbeat
+        changes = {}
+
+        for point, value in values.items():
+            previous = self.reported.get(point)
+            if (
+                previous is None
+                or deadband.exceeded(reported=previous[0], value=value)
+                or (heartbeat is not None and deadline - previous[1] >= heartbeat)
+            ):
+                changes[point] = value
+                self.reported[point] = (value, deadline)
+
+        return changes
+
+
+@attr.s(auto_attribs=True)
+class Poller:
+    """Periodically reads groups of points through a client.  Polls are scheduled on
+    absolute deadlines so that time spent reading does not accumulate as drift.
+    Groups that come due together are read with shared requests.  If a poll overruns
+    any of the following deadlines, those polls are skipped rather than run late.
+
+    When a shared read receives a Modbus exception response, each group is read on
+    its own and the groups that still fail get a result with the error.  Groups whose
+    receive channel has been closed are no longer polled.  Neither stops polling of
+    the other groups.
+
+    .. code-block:: python
+
+        poller = Poller(client=client)
+        fast_results = poller.add_group(group=PollGroup(points=fast, interval=0.5))
+        slow_results = poller.add_group(group=PollGroup(points=slow, interval=5))
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(poller.run)
+
+            async for result in fast_results:
+                ...
+    """
+
+    client: ssst.sunspec.client.Client
+    """The client to read through."""
+    max_gap: int = 0
+    """See :meth:`ssst.sunspec.client.Client.read_points`."""
+    _subscriptions: typing.List[_Subscription] = attr.ib(factory=list, init=False)
+    _plans: typing.Dict[
+        typing.Tuple[PollGroup, ...], ssst.sunspec.client.ReadPlan
+    ] = attr.ib(factory=dict, init=False)
+
+    def add_group(
+        self, group: PollGroup, max_buffer_size: float = math.inf
+    ) -> "trio.MemoryReceiveChannel[PollResult]":
+        """Add a group to be polled.  Groups must be added before polling is started.
+
+        Arguments:
+            group: The group to poll.
+            max_buffer_size: The number of results to buffer for the receiver.  When
+                the buffer is full, polling waits for the receiver.
+
+        Returns:
+            The channel the group's results will be delivered through.  It will be
+            closed when polling stops.  Closing it stops polling of the group.
+        """
+        send_channel, receive_channel = trio.open_memory_channel[PollResult](
+            max_buffer_size
+        )
+        self._subscriptions.append(
+            _Subscription(
+                group=group,
+                send_channel=send_channel,
+                interval_ticks=max(1, round(group.interval * ticks_per_second)),
+            )
+        )
+        self._plans.clear()
+
+        return receive_channel
+
+    async def run(
+        self,
+        *,
+        task_status: trio_typing.TaskStatus[None] = trio.TASK_STATUS_IGNORED,
+    ) -> None:
+        """Poll the groups until cancelled or until every group's receive channel has
+        been closed.  The first poll of every group is made immediately.
+
+        Arguments:
+            task_status: Generally passed by :meth:`trio.Nursery.start`, and otherwise
+                unspecified.
+        """
+        try:
+            start = trio.current_time()
+            task_status.started()
+
+            while len(self._subscriptions) > 0:
+                tick = min(
+                    self._tick(subscription=subscription)
+                    for subscription in self._subscriptions
+                )
+                deadline = start + tick / ticks_per_second
+                await trio.sleep_until(deadline)
+
+                due = [
+                    subscription
+                    for subscription in self._subscriptions
+                    if self._tick(subscription=subscription) <= tick
+                ]
+                await self._poll(due=due, deadline=deadline)
+
+                now_tick = math.floor((trio.current_time() - start) * ticks_per_second)
+                for subscription in due:
+                    subscription.cycle = max(
+                        subscription.cycle + 1,
+                        now_tick // subscription.interval_ticks + 1,
+                    )
+        finally:
+            for subscription in self._subscriptions:
+                subscription.send_channel.close()  # type: ignore[attr-defined]
+
+    def _tick(self, subscription: _Subscription) -> int:
+        """Calculate the next deadline of the passed subscription.
+
+        Arguments:
+            subscription: The subscription to calculate the deadline for.
+
+        Returns:
+            The deadline in ticks after the start of polling.
+        """
+        return subscription.cycle * subscription.interval_ticks
+
+    async def _poll(self, due: typing.List[_Subscription], deadline: float) -> None:
+        """Read the points of all the passed subscriptions with shared requests and
+        deliver the results.
+
+        Arguments:
+            due: The subscriptions to poll.
+            deadline: The deadline the subscriptions were due at.
+        """
+        groups = tuple(subscription.group for subscription in due)
+        plan = self._plans.get(groups)
+        if plan is None:
+            points = list(
+                dict.fromkeys(point for group in groups for point in group.points)
+            )
+            plan = self.client.build_read_plan(points=points, max_gap=self.max_gap)
+            self._plans[groups] = plan
+
+        try:
+            values = await self.client.execute_read_plan(plan=plan)
+        except ssst.ModbusError as error:
+            if len(due) > 1:
+                # Only some of the groups may be affected.
+                for subscription in due:
+                    await self._poll(due=[subscription], deadline=deadline)
+                return
+
+            [subscription] = due
+            result = PollResult(
+                group=subscription.group,
+                deadline=deadline,
+                values={},
+                error=error,
+            )
+            await self._send(subscription=subscription, result=result)
+            return
+
+        values_by_point = dict(zip(plan.points, values))
+
+        for subscription in due:
+            changes = subscription.changes(
+                values={
+                    point: values_by_point[point] for point in subscription.group.points
+                },
+                deadline=deadline,
+            )
+            if len(changes) == 0:
+                continue
+
+            result = PollResult(
+                group=subscription.group,
+                deadline=deadline,
+                values=changes,
+            )
+            await self._send(subscription=subscription, result=result)
+
+    async def _send(self, subscription: _Subscription, result: PollResult) -> None:
+        """Deliver the passed result, or stop polling the subscription's group if its
+        receive channel has been closed.
+
+        Arguments:
+            subscription: The subscription to deliver to.
+            result: The result to deliver.
+        """
+        try:
+            await subscription.send_channel.send(result)
+        except trio.BrokenResourceError:
+            subscription.send_channel.close()  # type: ignore[attr-defined]
+            self._subscriptions.remove(subscription)
@@ -0,0 +1,150 @@
+import json
+import pathlib
+import typing
+
+import attr
+import sunspec2.modbus.client
+
+
+format_version = 1
+"""The version of the on-disk format written by :meth:`ScanCache.save`.  Files of
+any other version are ignored when loading."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class DeviceIdentity:
+    """The identity of a SunSpec device as reported by the common model (model 1)."""
+
+    manufacturer: str
+    """The ``Mn`` point."""
+    model: str
+    """The ``Md`` point."""
+    serial_number: str
+    """The ``SN`` point."""
+
+    @classmethod
+    def from_model(
+        cls, model: sunspec2.modbus.client.SunSpecModbusClientModel
+    ) -> "DeviceIdentity":
+        """Build the identity from the local data of the passed common model.
+        Unimplemented points are treated as empty strings.
+
+        Arguments:
+            model: The common model to read the identity from.
+
+        Returns:
+            The device identity.
+        """
+        return cls(
+            manufacturer=model.points["Mn"].cvalue or "",
+            model=model.points["Md"].cvalue or "",
+            serial_number=model.points["SN"].cvalue or "",
+        )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ModelLayout:
+    """The location of a single model in the device's register space."""
+
+    id: int
+    """The integer model ID."""
+    address: int
+    """The address of the model's ID register."""
+    length: int
+    """The model length exclusive of the model's ID and length header."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class DeviceLayout:
+    """The register layout of a scanned SunSpec device."""
+
+    base_address: int
+    """The address of the SunSpec sentinel."""
+    models: typing.Tuple[ModelLayout, ...]
+    """The models in the device, in register order."""
+
+    @property
+    def end_address(self) -> int:
+        """The address of the end model ID that follows the last model."""
+        if len(self.models) == 0:
+            return self.base_address + 2
+
+        last_model = self.models[-1]
+        return last_model.address + 2 + last_model.length
+
+
+@attr.s(auto_attribs=True)
+class ScanCache:
+    """Device layouts found by previous scans, keyed by device identity.  Pass an
+    instance to :meth:`ssst.sunspec.client.Client.scan` to have it verify a known
+    layout instead of walking the model chain, and to record newly scanned layouts.
+    The cache is only read from and written to disk when explicitly requested.
+
+    .. code-block:: python
+
+        cache = ScanCache.load(path=path)
+        await client.scan(cache=cache)
+        cache.save(path=path)
+    """
+
+    layouts: typing.Dict[DeviceIdentity, DeviceLayout] = attr.ib(factory=dict)
+    """The known layouts."""
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "ScanCache":
+        """Load a cache from the passed path.  A missing file or a file of another
+        format version results in an empty cache.
+
+        Arguments:
+            path: The file to load from.
+
+        Returns:
+            The loaded cache.
+        """
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return cls()
+
+        raw = json.loads(text)
+        if raw.get("version") != format_version:
+            return cls()
+
+        return cls(
+            layouts={
+                DeviceIdentity(**device["identity"]): DeviceLayout(
+                    base_address=device["base_address"],
+                    models=tuple(ModelLayout(**model) for model in device["models"]),
+                )
+                for device in raw["devices"]
+            },
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Save the cache to the passed path.
+
+        Arguments:
+            path: The file to save to.
+        """
+        raw = {
+            "version": format_version,
+            "devices": [
+                {
+                    "identity": attr.asdict(identity),
+                    **attr.asdict(layout, recurse=True),
+                }
+                for identity, layout in self.layouts.items()
+            ],
+        }
+
+        path.write_text(json.dumps(raw, indent=4), encoding="utf-8")
+
+    def base_addresses(self) -> typing.List[int]:
+        """Collect the distinct base addresses of all cached layouts.
+
+        Returns:
+            The base addresses in order of first appearance.
+        """
+        return list(
+            dict.fromkeys(layout.base_address for layout in self.layouts.values())
+        )
@@ -15,6 +15,11 @@ import ssst.sunspec
 
 base_address = 40_000
 
+end_model_bytes = sunspec2.mb.SUNS_END_MODEL_ID.to_bytes(
+    length=2, byteorder="big", signed=False
+) + bytes(2)
+"""The raw end model ID and zero length that follow the last model."""
+
 
 @attr.s(auto_attribs=True)
 class ModelSummary:
@@ -32,55 +37,157 @@ class ModelSummary:
 @attr.s(auto_attribs=True)
 class SunSpecModbusSlaveContext(pymodbus.interfaces.IModbusSlaveContext):
     """A :mod:`pymodbus` slave context that is backed by the ``pysunspec2`` device
-    object."""
+    object.  Requests are served from a register image that is kept alongside the
+    device object.  Since the points may be changed directly, each request refreshes
+    the image from only the points it overlaps before using it, and writes decode only
+    the points they touch, so the cost of a request depends on its size rather than
+    the size of the device.  Writes to scale factor points update the scale factors
+    of their dependent points.
+    """
 
     sunspec_device: sunspec2.modbus.client.SunSpecModbusClientDevice
     """The ``pysunspec2`` device object use for local storage of the SunSpec data."""
+    scale_factor_indexes: typing.Dict[
+        sunspec2.modbus.client.SunSpecModbusClientModel,
+        ssst.sunspec.ScaleFactorIndex,
+    ] = attr.ib(init=False, repr=False)
+    """The scale factor dependency index for each model, built from the models
+    present when the context is created."""
+    point_address_index: ssst.sunspec.PointAddressIndex = attr.ib(
+        init=False, repr=False
+    )
+    """The index of the points by address, built from the models present when the
+    context is created."""
+    register_image: bytearray = attr.ib(init=False, repr=False)
+    """All registers from the base address through the end model. Each register is a
+    2-byte chunk stored in big-endian byte order.  The registers of a point are only
+    up to date while a request involving them is being served."""
+    register_view: memoryview = attr.ib(init=False, repr=False)
+    """A view of the whole :attr:`SunSpecModbusSlaveContext.register_image`, sliced to
+    serve reads without copying.  The image must therefore never be resized."""
+    end_address: int = attr.ib(init=False)
+    """The exclusive last address.  This is the first address which cannot be read.
+    """
 
-    def getValues(self, fx: int, address: int, count: int = 1) -> bytearray:
-        """See :meth:`pymodbus.interfaces.IModbusSlaveContext.getValues`."""
-        request = PreparedRequest.build(
-            base_address=self.sunspec_device.base_addr,
-            requested_address=address,
-            count=count,
-            all_registers=self.sunspec_device.get_mb(),
+    def __attrs_post_init__(self) -> None:
+        self.scale_factor_indexes = {
+            model: ssst.sunspec.build_scale_factor_index(model=model)
+            for model in self.sunspec_device.model_list
+        }
+        self.point_address_index = ssst.sunspec.PointAddressIndex.build(
+            models=self.sunspec_device.model_list
         )
-        return request.data[request.slice]
+        self.register_image = bytearray(ssst.sunspec.base_address_sentinel)
+        self.register_image.extend(self.sunspec_device.get_mb())
+        self.register_image.extend(end_model_bytes)
+        self.register_view = memoryview(self.register_image)
+        self.end_address = self.sunspec_device.base_addr + len(self.register_image) // 2
+
+    def getValues(self, fx: int, address: int, count: int = 1) -> memoryview:
+        """See :meth:`pymodbus.interfaces.IModbusSlaveContext.getValues`.  The
+        returned view shares the register image rather than copying it so it is only
+        valid until the next request is served.
+        """
+        self._refresh_register_image(address=address, count=count)
+        image_slice = self._image_slice(address=address, count=count)
+        return self.register_view[image_slice]
 
     def setValues(self, fx: int, address: int, values: bytes) -> None:
         """See :meth:`pymodbus.interfaces.IModbusSlaveContext.setValues`."""
-        request = PreparedRequest.build(
-            base_address=self.sunspec_device.base_addr,
-            requested_address=address,
-            count=len(values) // 2,
-            all_registers=self.sunspec_device.get_mb(),
-        )
-        data = bytearray(request.data)
-        data[request.slice] = values
-        self.sunspec_device.set_mb(data=data[len(ssst.sunspec.base_address_sentinel) :])
+        count = len(values) // 2
+        points = self._refresh_register_image(address=address, count=count)
+        image_slice = self._image_slice(address=address, count=count)
+        self.register_image[image_slice] = values[: 2 * count]
+
+        for point in points:
+            point_slice = self._image_slice(
+                address=point.model.model_addr + point.offset, count=point.len
+            )
+            point.set_mb(data=self.register_image[point_slice])
+
+            if point.pdef["type"] == "sunssf":
+                scale_factor = point.cvalue
+                index = self.scale_factor_indexes[point.model]
+                for dependent_point in index[point.pdef["name"]]:
+                    dependent_point.sf_value = scale_factor
+
+        # The sentinel and end model ID are fixed.
+        sentinel_length = len(ssst.sunspec.base_address_sentinel)
+        self.register_image[:sentinel_length] = ssst.sunspec.base_address_sentinel
+        self.register_image[-len(end_model_bytes) :] = end_model_bytes
+
+    def _refresh_register_image(
+        self, address: int, count: int
+    ) -> typing.List[sunspec2.modbus.client.SunSpecModbusClientPoint]:
+        """Copy the current data of the points overlapping the passed register range
+        into the register image.
+
+        Arguments:
+            address: The first register of the range.
+            count: The number of registers in the range.
+
+        Returns:
+            The SunSpec point objects refreshed.
+        """
+        points = self.point_address_index.overlapping(address=address, count=count)
+
+        for point in points:
+            point_slice = self._image_slice(
+                address=point.model.model_addr + point.offset, count=point.len
+            )
+            self.register_image[point_slice] = point.get_mb()
+
+        return points
+
+    def _image_slice(self, address: int, count: int) -> slice:
+        """Build the slice of the register image covering the passed register range.
+
+        Arguments:
+            address: The first register of the range.
+            count: The number of registers in the range.
+
+        Returns:
+            The slice of bytes.
+        """
+        offset = 2 * (address - self.sunspec_device.base_addr)
+        return slice(offset, offset + 2 * count)
 
     def validate(self, fx: int, address: int, count: int = 1) -> bool:
         """See :meth:`pymodbus.interfaces.IModbusSlaveContext.validate`."""
         return (
             self.sunspec_device.base_addr <= address
-            and address + count <= self._end_address()
+            and address + count <= self.end_address
         )
 
-    def _end_address(self) -> int:
-        """Calculate the exclusive last address.  This is the first address which
-        cannot be read.
-        """
-        return (
-            base_address
-            + (
-                (
-                    len(ssst.sunspec.base_address_sentinel)
-                    + len(self.sunspec_device.get_mb())
-                )
-                // 2
-            )
-            + 2
+
+def build_slave_context(
+    model_summaries: typing.Sequence[ModelSummary], base_address: int
+) -> SunSpecModbusSlaveContext:
+    """Build the slave context for a single device providing the passed models laid
+    out from the passed base address.
+
+    Arguments:
+        model_summaries: The models which you want the device to provide.
+        base_address: The address of the SunSpec sentinel.
+
+    Returns:
+        The slave context.
+    """
+    address = base_address + len(ssst.sunspec.base_address_sentinel) // 2
+    sunspec_device = sunspec2.modbus.client.SunSpecModbusClientDevice()
+    sunspec_device.base_addr = base_address
+
+    for model_summary in model_summaries:
+        model = sunspec2.modbus.client.SunSpecModbusClientModel(
+            model_id=model_summary.id,
+            model_addr=address,
+            model_len=model_summary.length,
+            mb_device=sunspec_device,
         )
+        address += 2 + model_summary.length
+        sunspec_device.add_model(model)
+
+    return SunSpecModbusSlaveContext(sunspec_device=sunspec_device)
 
 
 @attr.s(auto_attribs=True)
@@ -100,45 +207,46 @@ class Server:
             ),
         )
 
+    A server built by :meth:`Server.build_multiple` hosts several devices, each at its
+    own Modbus unit ID, the way a plant gateway does.
+
     .. automethod:: __getitem__
     """
 
     slave_context: SunSpecModbusSlaveContext
-    """The single slave context to be served by this server.  This is backed by the
-    SunSpec device object.
+    """The slave context accessed through this server object.  This is backed by the
+    SunSpec device object.  For a single device server, it is served at every unit
+    ID.  See :meth:`Server.for_unit` for the other devices of a multiple device
+    server.
     """
     server_context: pymodbus.datastore.ModbusServerContext
-    """The datastore for this pymodbus server.  Presently only a single slave context
-    is supported."""
+    """The datastore for this pymodbus server."""
     identity: pymodbus.device.ModbusDeviceIdentification
     """The identity information for this Modbus server."""
+    slave_contexts: typing.Dict[int, SunSpecModbusSlaveContext] = attr.ib(factory=dict)
+    """The slave context of each device by unit ID for a multiple device server, or
+    empty for a single device server."""
 
     @classmethod
-    def build(cls, model_summaries: typing.Sequence[ModelSummary]) -> "Server":
+    def build(
+        cls,
+        model_summaries: typing.Sequence[ModelSummary],
+        base_address: int = base_address,
+    ) -> "Server":
         """Build the server instance based on the passed model summaries.  Any
         per-point or bulk data update must be done separately.
 
         Arguments:
             model_summaries: The models which you want the server to provide.
+            base_address: The address of the SunSpec sentinel.
 
         Returns:
             The instance of the server datastore pieces.
         """
-        address = base_address + len(ssst.sunspec.base_address_sentinel) // 2
-        sunspec_device = sunspec2.modbus.client.SunSpecModbusClientDevice()
-        sunspec_device.base_addr = base_address
-
-        for model_summary in model_summaries:
-            model = sunspec2.modbus.client.SunSpecModbusClientModel(
-                model_id=model_summary.id,
-                model_addr=address,
-                model_len=model_summary.length,
-                mb_device=sunspec_device,
-            )
-            address += 2 + model_summary.length
-            sunspec_device.add_model(model)
-
-        slave_context = SunSpecModbusSlaveContext(sunspec_device=sunspec_device)
+        slave_context = build_slave_context(
+            model_summaries=model_summaries,
+            base_address=base_address,
+        )
 
         return cls(
             slave_context=slave_context,
@@ -149,6 +257,68 @@ class Server:
             identity=pymodbus.device.ModbusDeviceIdentification(),
         )
 
+    @classmethod
+    def build_multiple(
+        cls,
+        unit_model_summaries: typing.Mapping[int, typing.Sequence[ModelSummary]],
+        base_address: int = base_address,
+    ) -> "Server":
+        """Build a server hosting an independent device at each of the passed unit
+        IDs.  Requests for other unit IDs are not answered.  The returned server object
+        accesses the device with the lowest unit ID.
+
+        .. code-block:: python
+
+            server = Server.build_multiple(
+                unit_model_summaries={unit: model_summaries for unit in range(1, 33)},
+            )
+            server.for_unit(unit=7)[103].points["W"].cvalue = 1500
+
+        Arguments:
+            unit_model_summaries: The models which you want each device to provide, by
+                unit ID.
+            base_address: The address of the SunSpec sentinel for all devices.
+
+        Returns:
+            The instance of the server datastore pieces.
+
+        Raises:
+            ValueError: When no units are passed.
+        """
+        if len(unit_model_summaries) == 0:
+            raise ValueError("At least one unit is required")
+
+        slave_contexts = {
+            unit: build_slave_context(
+                model_summaries=model_summaries,
+                base_address=base_address,
+            )
+            for unit, model_summaries in sorted(unit_model_summaries.items())
+        }
+
+        return cls(
+            slave_context=next(iter(slave_contexts.values())),
+            server_context=pymodbus.datastore.ModbusServerContext(
+                slaves=slave_contexts,
+                single=False,
+            ),
+            identity=pymodbus.device.ModbusDeviceIdentification(),
+            slave_contexts=slave_contexts,
+        )
+
+    def for_unit(self, unit: int) -> "Server":
+        """Access the device at another unit ID of a multiple device server.  The
+        returned object shares the datastore with this one so either may be used to
+        serve.
+
+        Arguments:
+            unit: The Modbus unit ID of the device.
+
+        Returns:
+            The server object accessing the device at the passed unit ID.
+        """
+        return attr.evolve(self, slave_context=self.slave_contexts[unit])
+
     def __getitem__(
         self, item: typing.Union[int, str]
     ) -> sunspec2.modbus.client.SunSpecModbusClientModel:
@@ -169,8 +339,11 @@ class Server:
         [model] = self.slave_context.sunspec_device.models[item]
         return model
 
-    async def tcp_server(self, server_stream: trio.SocketStream) -> None:
-        """Handle serving over a stream.  See :class:`Server` for an example.
+    async def tcp_server(self, server_stream: trio.abc.Stream) -> None:
+        """Handle serving over a stream.  See :class:`Server` for an example.  Any
+        stream may be used, such as one half of a
+        :func:`trio.testing.memory_stream_pair` as done by
+        :func:`ssst.sunspec.client.open_memory_client`.
 
         Arguments:
             server_stream: The stream to communicate over.
@@ -181,54 +354,3 @@ class Server:
             context=self.server_context,
             identity=self.identity,
         )
-
-
-@attr.s(auto_attribs=True)
-class PreparedRequest:
-    """Holds some common bits used in serving a request."""
-
-    data: bytearray
-    """The entire block of registers.  Each register is a 2-byte chunk stored in
-    big-endian byte order.  The first element is the high byte of the server's register
-    located at the base address.
-    """
-    slice: slice
-    """The slice covering the bytes of the registers to be operated on."""
-    offset_address: int
-    """The offset in 16-bit/2-byte registers relative to the server's base address."""
-    bytes_offset_address: int
-    """The offset in bytes relative to the server's base address."""
-
-    @classmethod
-    def build(
-        cls, base_address: int, requested_address: int, count: int, all_registers: bytes
-    ) -> "PreparedRequest":
-        """Build the instance based on the passed raw request information.
-
-        Arguments:
-            base_address: The SunSpec base register address.
-            requested_address: The requested address.
-            count: The requested register count.
-            all_registers: The raw register data for all models.
-
-        Returns:
-            The prepared request information.
-        """
-        # This is super lazy, what with building _all_ data even if you only need a
-        # register or two.  But, optimize when we need to.
-        data = bytearray(ssst.sunspec.base_address_sentinel)
-        data.extend(all_registers)
-        data.extend(
-            sunspec2.mb.SUNS_END_MODEL_ID.to_bytes(
-                length=2, byteorder="big", signed=False
-            )
-        )
-
-        offset_address = requested_address - base_address
-
-        return cls(
-            data=data,
-            slice=slice(2 * offset_address, 2 * (offset_address + count)),
-            offset_address=offset_address,
-            bytes_offset_address=2 * offset_address,
-        )
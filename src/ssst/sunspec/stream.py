@@ -0,0 +1,172 @@
+import typing
+
+import attr
+import pymodbus.factory
+import pymodbus.framer.socket_framer
+import pymodbus.pdu
+import pymodbus.register_read_message
+import pymodbus.register_write_message
+import trio
+import trio_typing
+
+
+max_transaction_id = 0xFFFF
+"""The largest Modbus TCP transaction ID.  IDs wrap around to zero after it."""
+
+
+def _create_framer() -> pymodbus.framer.socket_framer.ModbusSocketFramer:
+    """Create a Modbus TCP framer for decoding responses.
+
+    Returns:
+        The framer.
+    """
+    return pymodbus.framer.socket_framer.ModbusSocketFramer(
+        decoder=pymodbus.factory.ClientDecoder(),
+    )
+
+
+@attr.s(auto_attribs=True, eq=False)
+class StreamProtocol:
+    """A Modbus TCP client protocol over any :class:`trio.abc.Stream`, such as one
+    half of a :func:`trio.testing.memory_stream_pair`.  Requests are framed with the
+    :mod:`pymodbus` socket framer and matched to their responses by transaction ID, so
+    several may be outstanding at once.  Only the requests used by
+    :class:`ssst.sunspec.client.Client` are provided.  :meth:`StreamProtocol.receive`
+    must be running for responses to be delivered.
+    """
+
+    stream: trio.abc.Stream
+    """The stream to communicate over."""
+    framer: pymodbus.framer.socket_framer.ModbusSocketFramer = attr.ib(
+        factory=_create_framer,
+    )
+    """The framer used to build requests and decode responses."""
+    _next_transaction_id: int = attr.ib(default=0, init=False)
+    _waiting: typing.Dict[
+        int, "trio.MemorySendChannel[pymodbus.pdu.ModbusResponse]"
+    ] = attr.ib(factory=dict, init=False)
+    _send_lock: trio.Lock = attr.ib(factory=trio.Lock, init=False)
+    _closed: bool = attr.ib(default=False, init=False)
+
+    async def read_holding_registers(
+        self, address: int, count: int, unit: int
+    ) -> pymodbus.pdu.ModbusResponse:
+        """Read sequential holding registers.
+
+        Arguments:
+            address: The first register to read.
+            count: The number of registers to read.
+            unit: The Modbus unit ID of the device.
+
+        Returns:
+            The response, which may be an exception response.
+
+        Raises:
+            trio.BrokenResourceError: When the stream is closed before the response
+                is received.
+        """
+        request = pymodbus.register_read_message.ReadHoldingRegistersRequest(
+            address=address, count=count, unit=unit
+        )
+        return await self.execute(request=request)
+
+    async def write_registers(
+        self, address: int, values: bytes, unit: int
+    ) -> pymodbus.pdu.ModbusResponse:
+        """Write sequential holding registers.
+
+        Arguments:
+            address: The first register to write.
+            values: The raw register data in big-endian byte order.
+            unit: The Modbus unit ID of the device.
+
+        Returns:
+            The response, which may be an exception response.
+
+        Raises:
+            trio.BrokenResourceError: When the stream is closed before the response
+                is received.
+        """
+        request = pymodbus.register_write_message.WriteMultipleRegistersRequest(
+            address=address, values=values, unit=unit
+        )
+        return await self.execute(request=request)
+
+    async def execute(
+        self, request: pymodbus.pdu.ModbusRequest
+    ) -> pymodbus.pdu.ModbusResponse:
+        """Send the passed request and wait for its response.
+
+        Arguments:
+            request: The request to send.  Its transaction ID is assigned here.
+
+        Returns:
+            The response.
+
+        Raises:
+            trio.BrokenResourceError: When the stream is closed before the response
+                is received.
+        """
+        if self._closed:
+            raise trio.BrokenResourceError("The stream has been closed.")
+
+        transaction_id = self._next_transaction_id
+        self._next_transaction_id = (transaction_id + 1) % (max_transaction_id + 1)
+        request.transaction_id = transaction_id
+
+        send_channel, receive_channel = trio.open_memory_channel[
+            pymodbus.pdu.ModbusResponse
+        ](1)
+        self._waiting[transaction_id] = send_channel
+
+        try:
+            async with self._send_lock:
+                await self.stream.send_all(self.framer.buildPacket(request))
+
+            try:
+                return await receive_channel.receive()
+            except trio.EndOfChannel:
+                raise trio.BrokenResourceError(
+                    "The stream was closed before the response was received."
+                ) from None
+        finally:
+            self._waiting.pop(transaction_id, None)
+
+    async def receive(
+        self,
+        *,
+        task_status: trio_typing.TaskStatus[None] = trio.TASK_STATUS_IGNORED,
+    ) -> None:
+        """Receive and deliver responses until the stream is closed by the other end.
+        Outstanding requests then fail, as do any made afterwards.
+
+        Arguments:
+            task_status: Generally passed by :meth:`trio.Nursery.start`, and otherwise
+                unspecified.
+        """
+        task_status.started()
+
+        try:
+            while True:
+                data = await self.stream.receive_some()
+                if len(data) == 0:
+                    break
+
+                self.framer.processIncomingPacket(
+                    data=data, callback=self._deliver, unit=0, single=True
+                )
+        finally:
+            self._closed = True
+            for send_channel in self._waiting.values():
+                send_channel.close()  # type: ignore[attr-defined]
+
+    def _deliver(self, response: pymodbus.pdu.ModbusResponse) -> None:
+        """Hand the passed response to the request waiting for it.  Responses for
+        requests no longer waiting are dropped.
+
+        Arguments:
+            response: The decoded response.
+        """
+        send_channel = self._waiting.pop(response.transaction_id, None)
+        if send_channel is not None:
+            send_channel.send_nowait(response)